@@ -8,10 +8,18 @@ Run this after starting the server with: uvicorn app:app --reload
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Shared session so every example reuses pooled keep-alive connections
+# instead of opening a fresh TCP connection per request
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 def example_1_single_prediction():
     """
@@ -36,10 +44,9 @@ def example_1_single_prediction():
     
     # Send POST request
     print(f"\n📤 Sending request to: {BASE_URL}/predict")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/predict",
-        json=payload,
-        headers={"Content-Type": "application/json"}
+        json=payload
     )
     
     # Process response
@@ -77,7 +84,7 @@ def example_2_latest_cves():
     print("⚠️  Note: This requires internet connection and may take a few seconds...")
     
     # Send GET request
-    response = requests.get(
+    response = SESSION.get(
         f"{BASE_URL}/predict/latest-cves",
         params=params
     )
@@ -131,22 +138,24 @@ def example_3_batch_predictions():
         "Denial of service via malformed packet processing",
     ]
     
-    results = []
-    
-    print(f"\n📤 Processing {len(descriptions)} descriptions...")
+    print(f"\n📤 Processing {len(descriptions)} descriptions concurrently...")
     
-    for idx, desc in enumerate(descriptions, 1):
-        print(f"   {idx}. Processing...")
-        
-        response = requests.post(
+    def predict_one(desc):
+        response = SESSION.post(
             f"{BASE_URL}/predict",
             json={"description": desc}
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            result['description_preview'] = desc[:50] + "..."
-            results.append(result)
+        if response.status_code != 200:
+            return None
+        
+        result = response.json()
+        result['description_preview'] = desc[:50] + "..."
+        return result
+    
+    # Requests overlap on the network; map() keeps results in input order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = [r for r in executor.map(predict_one, descriptions) if r is not None]
     
     print(f"\n✅ Successfully processed {len(results)}/{len(descriptions)} descriptions")
     print("\n📋 Results:")
@@ -169,7 +178,7 @@ def example_4_error_handling():
     # Test with invalid input (too short)
     print("\n📤 Test 1: Description too short")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/predict",
         json={"description": "Short text"}
     )
@@ -181,7 +190,7 @@ def example_4_error_handling():
     # Test with missing field
     print("\n📤 Test 2: Missing description field")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/predict",
         json={"wrong_field": "value"}
     )
@@ -199,7 +208,7 @@ def example_5_health_check():
     print("EXAMPLE 5: Health Check")
     print("="*80)
     
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     
     if response.status_code == 200:
         result = response.json()
@@ -209,6 +218,40 @@ def example_5_health_check():
         print(f"\n❌ Health check failed: {response.status_code}")
 
 
+def example_6_stream_latest_cves():
+    """
+    Example 6: Stream latest CVE predictions as NDJSON
+    """
+    print("\n" + "="*80)
+    print("EXAMPLE 6: Stream Latest CVEs (NDJSON)")
+    print("="*80)
+    
+    params = {
+        "days_back": 3,
+        "max_results": 5
+    }
+    
+    print(f"\n📤 Streaming from: {BASE_URL}/predict/latest-cves/stream")
+    print("⚠️  Note: This requires internet connection; results print as they arrive...")
+    
+    with SESSION.get(f"{BASE_URL}/predict/latest-cves/stream", params=params, stream=True) as response:
+        if response.status_code != 200:
+            print(f"\n❌ Error: {response.status_code}")
+            print(response.text)
+            return
+        
+        count = 0
+        for line in response.iter_lines():
+            if not line:
+                continue
+            cve = json.loads(line)
+            count += 1
+            anomaly_flag = "⚠️ ANOMALOUS" if cve['anomalous'] else ""
+            print(f"{count}. {cve['cve_id']:20} | {cve['risk']:6} ({cve['confidence']:.1%}) {anomaly_flag}")
+    
+    print(f"\n✅ Streamed {count} CVEs")
+
+
 def main():
     """
     Run all examples
@@ -236,6 +279,7 @@ def main():
     choice = input("\nRun Example 2 (Fetch Latest CVEs - requires internet)? [y/N]: ")
     if choice.lower() == 'y':
         example_2_latest_cves()
+        example_6_stream_latest_cves()
     
     # Ask before error handling demo
     choice = input("\nRun Example 4 (Error Handling Demo)? [y/N]: ")
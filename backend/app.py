@@ -5,7 +5,9 @@ REST API that exposes ML-based CVE risk prediction via HTTP endpoints.
 
 Key Features:
 - POST /predict - Predict risk for a single CVE description
+- POST /predict/batch - Predict risk for many descriptions in one call
 - GET /predict/latest-cves - Fetch and analyze recent CVEs from NVD
+- GET /predict/latest-cves/stream - Same, streamed as NDJSON
 
 Design Principles:
 - Models loaded at startup (not per request)
@@ -14,21 +16,39 @@ Design Principles:
 - CORS enabled for frontend integration
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Dict, List, Set, Tuple
+import asyncio
+import contextlib
+import httpx
 import logging
+import msgpack
+import orjson
 import os
-import uuid
+import secrets
 
 # Import existing prediction functions (DO NOT MODIFY THESE)
 from cve_realtime_processor import (
-    predict_risk,
-    detect_anomaly,
-    process_new_cves
+    DigestLRUCache,
+    analyze_descriptions,
+    fetch_cves_from_nvd_async,
+    load_models,
+    missing_model_files,
+    predict_cve_batch,
+    process_new_cves_async,
+    result_cache_stats
 )
 
+# The processor loads models lazily; the API wants them resident before the
+# first request (and, under gunicorn preload_app, before workers fork so the
+# pages are shared), so load them eagerly at import.
+models = load_models()
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,14 +60,18 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="CVE Risk Prediction API",
     description="REST API for ML-based CVE risk prediction with anomaly detection",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes dict/list payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for frontend integration
 # Read additional origins from environment variable (comma-separated)
 extra_origins = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 
-allowed_origins = [
+# Local frontend dev servers; omitted when ENV=production so production
+# only allows the origins listed in CORS_ORIGINS
+dev_origins = [
     "http://localhost:3000",
     "http://localhost:5173",
     "http://localhost:5174",
@@ -56,7 +80,10 @@ allowed_origins = [
     "http://127.0.0.1:5173",
     "http://127.0.0.1:5174",
     "http://127.0.0.1:8080",
-] + extra_origins
+] if os.getenv("ENV", "development") != "production" else []
+
+# frozenset: the middleware checks every request's Origin with `in`
+allowed_origins = frozenset(dev_origins + extra_origins)
 
 app.add_middleware(
     CORSMiddleware,
@@ -76,14 +103,42 @@ class PredictRequest(BaseModel):
         description="CVE vulnerability description text (minimum 20 characters)"
     )
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={
             "example": {
                 "description": "A remote code execution vulnerability exists in the web application framework that allows an attacker to execute arbitrary code by sending specially crafted requests to the server endpoint."
             }
         }
+    )
+
+
+class BatchRequest(BaseModel):
+    """Request model for /predict/batch endpoint"""
+    descriptions: List[Annotated[str, Field(min_length=20)]] = Field(
+        ...,
+        min_length=1,
+        max_length=256,
+        description="CVE vulnerability descriptions (1-256 items, each minimum 20 characters)"
+    )
+    
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={
+            "example": {
+                "descriptions": [
+                    "Buffer overflow in network service allows remote code execution",
+                    "Cross-site scripting vulnerability in web application input validation"
+                ]
+            }
+        }
+    )
 
 
+# Response models document the OpenAPI schema only. Handlers return plain
+# dicts built from trusted prediction output and routes set
+# response_model=None, so FastAPI skips a second validation pass.
+
 class PredictResponse(BaseModel):
     """Response model for /predict endpoint"""
     risk: str = Field(..., description="Risk level: HIGH, MEDIUM, or LOW")
@@ -91,8 +146,8 @@ class PredictResponse(BaseModel):
     anomalous: bool = Field(..., description="Whether the pattern is anomalous")
     anomaly_score: float = Field(..., description="Anomaly score (lower = more anomalous)")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "risk": "HIGH",
                 "confidence": 0.87,
@@ -100,24 +155,205 @@ class PredictResponse(BaseModel):
                 "anomaly_score": 0.15
             }
         }
+    )
 
 
 class CVEPrediction(BaseModel):
     """Model for individual CVE prediction in batch results"""
     cve_id: str = Field(..., description="CVE identifier (e.g., CVE-2024-1234)")
     risk: str = Field(..., description="Risk level: HIGH, MEDIUM, or LOW")
+    risk_code: int = Field(..., description="Integer risk code: 2=HIGH, 1=MEDIUM, 0=LOW")
     confidence: float = Field(..., description="Confidence score (0.0 to 1.0)")
     anomalous: bool = Field(..., description="Whether the pattern is anomalous")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "cve_id": "CVE-2024-1234",
                 "risk": "MEDIUM",
+                "risk_code": 1,
                 "confidence": 0.65,
                 "anomalous": True
             }
         }
+    )
+
+
+# --- Batch Prediction Helper ---
+
+def _predict_batch(descriptions: List[str]) -> List[dict]:
+    """
+    Score many descriptions with one vectorizer/model call per stage
+    and shape the results like /predict responses.
+    """
+    risk_results, anomaly_results = analyze_descriptions(descriptions)
+    
+    return [
+        {
+            "risk": risk_result["risk"],
+            "confidence": risk_result["confidence"],
+            "anomalous": anomaly_result["anomalous"],
+            "anomaly_score": anomaly_result["anomaly_score"]
+        }
+        for risk_result, anomaly_result in zip(risk_results, anomaly_results)
+    ]
+
+
+# --- Inference Concurrency Limit ---
+# Model calls run in worker threads; cap how many run at once so bursts of
+# requests queue here instead of oversubscribing CPU cores. The threads are
+# a dedicated pool, separate from the loop's default executor that
+# asyncio.to_thread uses (e.g. the /predict/latest-cves pipeline), so a long
+# NVD scoring run cannot starve /predict; sklearn's Cython tree traversal
+# releases the GIL, so threads scale across cores.
+
+INFERENCE_CONCURRENCY = os.cpu_count() or 4
+
+_inference_sem = asyncio.Semaphore(INFERENCE_CONCURRENCY)
+_inference_executor = ThreadPoolExecutor(
+    max_workers=INFERENCE_CONCURRENCY,
+    thread_name_prefix="inference"
+)
+
+
+async def _run_inference(func, *args):
+    """Run a blocking model call on the inference pool, within the limit."""
+    async with _inference_sem:
+        return await asyncio.get_running_loop().run_in_executor(_inference_executor, func, *args)
+
+
+# --- Micro-Batching ---
+# Concurrent /predict requests are coalesced into one _predict_batch() call:
+# TF-IDF and forest scoring cost is dominated by per-call overhead, so one
+# call over N descriptions is far cheaper than N calls over one.
+
+MICRO_BATCH_MAX_SIZE = 64
+MICRO_BATCH_MAX_WAIT = 0.005  # seconds the first request waits for company
+
+
+class MicroBatcher:
+    """
+    Queue in front of _predict_batch(). Requests submit one description and
+    await a future; a background task collects up to max_size queued items
+    (waiting at most max_wait after the first) and scores them together.
+    
+    Once stopped (or if never started), pending and new requests fail with
+    a 503 instead of waiting on a collector that is not running.
+    """
+    
+    def __init__(self, max_size: int = MICRO_BATCH_MAX_SIZE, max_wait: float = MICRO_BATCH_MAX_WAIT):
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._collector: asyncio.Task = None
+        self._batches: Set[asyncio.Task] = set()
+    
+    def start(self):
+        """Start the collector task (call from the running event loop)."""
+        self._collector = asyncio.create_task(self._collect())
+    
+    async def stop(self):
+        """
+        Cancel the collector and any batches still being scored, then fail
+        every request still waiting (in a cancelled batch or the queue).
+        """
+        tasks = [*self._batches]
+        if self._collector is not None:
+            tasks.append(self._collector)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        
+        while not self._queue.empty():
+            self._fail([self._queue.get_nowait()])
+    
+    async def submit(self, description: str) -> dict:
+        """Queue one description and wait for its /predict-shaped result."""
+        if self._collector is None or self._collector.done():
+            raise self._unavailable()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((description, future))
+        return await future
+    
+    @staticmethod
+    def _unavailable() -> HTTPException:
+        return HTTPException(status_code=503, detail={"error": "Prediction service is shutting down"})
+    
+    def _fail(self, batch: List[Tuple[str, asyncio.Future]], exc: BaseException = None):
+        """Fail every still-pending future in batch (503 by default)."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc or self._unavailable())
+    
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            try:
+                while len(batch) < self.max_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Items already taken off the queue would otherwise hang
+                self._fail(batch)
+                raise
+            
+            # Score in its own task so the next batch can form meanwhile;
+            # _run_inference() still bounds how many run at once
+            task = asyncio.create_task(self._score(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _score(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            results = await _run_inference(_predict_batch, [desc for desc, _ in batch])
+        except asyncio.CancelledError:
+            # CancelledError is a BaseException: not caught below
+            self._fail(batch)
+            raise
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():  # Caller may have disconnected
+                future.set_result(result)
+
+
+_predict_batcher = MicroBatcher()
+
+
+# --- Prediction Cache ---
+# Repeated descriptions (dashboards, replayed corpora) skip the worker thread
+# and semaphore entirely. Same digest-keyed LRU the processor uses for its
+# per-model result caches.
+
+PREDICT_CACHE_SIZE = 4096
+
+_predict_cache = DigestLRUCache(PREDICT_CACHE_SIZE)
+
+
+# --- Latest CVEs Cache ---
+# Dashboard polls with the same parameters are served without re-hitting
+# the NVD API (which is slow and rate-limited) or re-running predictions.
+
+LATEST_CVES_CACHE_TTL = 300  # seconds
+LATEST_CVES_CLIENT_MAX_AGE = 60  # seconds, advertised via Cache-Control
+
+_latest_cves_cache: TTLCache = TTLCache(maxsize=64, ttl=LATEST_CVES_CACHE_TTL)
+_latest_cves_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+STREAM_BATCH_SIZE = 32  # CVEs scored per model call on the NDJSON stream
 
 
 # --- Startup Event: Verify Models are Loaded ---
@@ -126,28 +362,56 @@ class CVEPrediction(BaseModel):
 async def startup_event():
     """
     Verify that ML models are loaded at startup.
-    Models are actually loaded in cve_realtime_processor module at import time.
+    Models are actually loaded by load_models() when this module is imported
+    (load times are logged there), so the first request pays no load cost.
     """
     logger.info("🚀 Starting CVE Risk Prediction API")
     
     # Verify required model files exist
-    required_files = [
-        "rf_model.pkl",
-        "tfidf_vectorizer.pkl",
-        "anomaly_model.pkl"
-    ]
-    
-    missing_files = [f for f in required_files if not os.path.exists(f)]
+    missing_files = missing_model_files()
     
     if missing_files:
         logger.error(f"❌ Missing model files: {missing_files}")
         raise FileNotFoundError(f"Required model files not found: {missing_files}")
     
+    # Models are deserialized when this module is imported; fail fast if
+    # that did not succeed and keep them pinned on app.state so they stay
+    # resident for the life of the worker.
+    if models.clf is None or models.vectorizer is None or models.anomaly_clf is None:
+        logger.error("❌ Model files exist but could not be loaded")
+        raise RuntimeError("ML models failed to load; see cve_realtime_processor logs")
+    
+    app.state.rf_model = models.clf
+    app.state.vectorizer = models.vectorizer
+    app.state.anomaly_model = models.anomaly_clf
+    app.state.models_loaded = True
+    
+    _predict_batcher.start()
+    
     logger.info("✅ All model files loaded successfully")
+    
+    if not os.getenv("NVD_API_KEY"):
+        logger.warning("NVD_API_KEY not set - NVD API requests will be rate-limited")
+    
+    # Shared async HTTP client for NVD requests (keep-alive connection pool)
+    app.state.http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    )
+    
     logger.info("📡 API ready at http://127.0.0.1:8000")
     logger.info("📚 Interactive docs at http://127.0.0.1:8000/docs")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the micro-batcher and inference pool; close the NVD HTTP client."""
+    await _predict_batcher.stop()
+    _inference_executor.shutdown(wait=False, cancel_futures=True)
+    await app.state.http_client.aclose()
+
+
 # --- API Endpoints ---
 
 @app.get("/")
@@ -161,8 +425,11 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "predict": "POST /predict",
+            "predict_batch": "POST /predict/batch",
             "latest_cves": "GET /predict/latest-cves",
+            "latest_cves_stream": "GET /predict/latest-cves/stream",
             "meta": "GET /meta",
+            "cache_stats": "GET /cache/stats",
             "health": "GET /health",
             "docs": "GET /docs"
         }
@@ -194,18 +461,27 @@ async def get_meta():
             "high_risk": ">= 0.70 probability",
             "medium_risk": "0.40 - 0.69 probability",
             "low_risk": "< 0.40 probability"
+        },
+        "response_formats": {
+            "default": "application/json",
+            "latest_cves": [
+                "application/json",
+                "application/msgpack (send 'Accept: application/msgpack')"
+            ],
+            "latest_cves_stream": "application/x-ndjson"
         }
     }
 
 
-@app.post("/predict", response_model=PredictResponse)
+@app.post("/predict", response_model=None, responses={200: {"model": PredictResponse}})
 async def predict(request: PredictRequest):
     """
     Predict risk level for a single CVE description.
     
     **Process:**
     1. Validates input description (minimum 20 characters)
-    2. Runs pre-trained ML model (no retraining)
+    2. Runs pre-trained ML model (no retraining), micro-batched with
+       concurrent requests
     3. Detects anomalous patterns using Isolation Forest
     4. Returns risk level (HIGH/MEDIUM/LOW) with confidence
     
@@ -223,22 +499,21 @@ async def predict(request: PredictRequest):
     ```
     """
     try:
-        # Call existing prediction function (reuse, don't modify)
-        risk_result = predict_risk(request.description)
+        key = DigestLRUCache.key(request.description)
+        result = _predict_cache.get(key)
         
-        # Call existing anomaly detection function
-        anomaly_result = detect_anomaly(request.description)
+        if result is None:
+            # Scored together with other in-flight /predict requests in a
+            # worker thread, so the event loop keeps serving meanwhile
+            result = await _predict_batcher.submit(request.description)
+            _predict_cache.put(key, result)
         
-        # Combine results into response format
-        return PredictResponse(
-            risk=risk_result["risk"],
-            confidence=float(risk_result["confidence"]),
-            anomalous=bool(anomaly_result["anomalous"]),
-            anomaly_score=float(anomaly_result["anomaly_score"])
-        )
+        return result
     
+    except HTTPException:
+        raise
     except Exception as e:
-        trace_id = str(uuid.uuid4())[:8]
+        trace_id = secrets.token_hex(4)
         logger.error(f"[{trace_id}] Prediction error: {e}")
         raise HTTPException(
             status_code=500,
@@ -246,8 +521,45 @@ async def predict(request: PredictRequest):
         )
 
 
-@app.get("/predict/latest-cves", response_model=List[CVEPrediction])
+@app.post("/predict/batch", response_model=None, responses={200: {"model": List[PredictResponse]}})
+async def predict_batch(request: BatchRequest):
+    """
+    Predict risk levels for multiple CVE descriptions in a single call.
+    
+    All descriptions are vectorized together and scored with one
+    Random Forest and one Isolation Forest call, so N predictions cost
+    one HTTP round trip instead of N.
+    
+    **Returns:**
+    List of predictions in the same order as `descriptions`, each with
+    the same fields as `POST /predict`.
+    
+    **Example Request:**
+    ```json
+    {
+      "descriptions": [
+        "Buffer overflow in network service allows remote code execution...",
+        "Cross-site scripting vulnerability in web application..."
+      ]
+    }
+    ```
+    """
+    try:
+        return await _run_inference(_predict_batch, request.descriptions)
+    
+    except Exception as e:
+        trace_id = secrets.token_hex(4)
+        logger.error(f"[{trace_id}] Batch prediction error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={"error": f"Batch prediction failed: {str(e)}", "trace_id": trace_id}
+        )
+
+
+@app.get("/predict/latest-cves", response_model=None, responses={200: {"model": List[CVEPrediction]}})
 async def predict_latest_cves(
+    request: Request,
+    response: Response,
     days_back: int = Query(default=3, ge=1, le=30, description="Number of days to look back (1-30)"),
     max_results: int = Query(default=10, ge=1, le=100, description="Maximum number of CVEs to fetch (1-100)")
 ):
@@ -269,10 +581,13 @@ async def predict_latest_cves(
     List of CVE predictions with:
     - `cve_id`: CVE identifier (e.g., CVE-2024-1234)
     - `risk`: Risk level (HIGH, MEDIUM, or LOW)
+    - `risk_code`: Integer risk code (2=HIGH, 1=MEDIUM, 0=LOW)
     - `confidence`: Prediction confidence
     - `anomalous`: Anomaly detection flag
     
     **Note:**
+    - Send `Accept: application/msgpack` for a compact binary (msgpack) body
+    - Results are cached per (days_back, max_results) for 5 minutes
     - Requires internet connection
     - May be rate-limited by NVD API
     - Set NVD_API_KEY environment variable for higher rate limits
@@ -283,6 +598,7 @@ async def predict_latest_cves(
       {
         "cve_id": "CVE-2024-1234",
         "risk": "HIGH",
+        "risk_code": 2,
         "confidence": 0.89,
         "anomalous": false
       }
@@ -290,38 +606,123 @@ async def predict_latest_cves(
     ```
     """
     try:
-        # Read NVD API key from environment (optional, but recommended)
-        api_key = os.getenv("NVD_API_KEY")
+        key = (days_back, max_results)
+        predictions = _latest_cves_cache.get(key)
+        
+        if predictions is None:
+            # One fetch per key on a cold cache; concurrent callers wait for it
+            async with _latest_cves_locks.setdefault(key, asyncio.Lock()):
+                predictions = _latest_cves_cache.get(key)
+                
+                if predictions is None:
+                    # Read NVD API key from environment (optional, but recommended)
+                    api_key = os.getenv("NVD_API_KEY")
+                    
+                    # NVD pages are awaited on the shared async client;
+                    # only the CPU-bound prediction step runs in a thread.
+                    # Rows already have the CVEPrediction shape with native
+                    # Python types, so they are returned without re-validation.
+                    predictions = await process_new_cves_async(
+                        app.state.http_client,
+                        days_back=days_back,
+                        max_results=max_results,
+                        api_key=api_key
+                    )
+                    _latest_cves_cache[key] = predictions
+        
+        headers = {
+            "Cache-Control": f"max-age={LATEST_CVES_CLIENT_MAX_AGE}",
+            "Vary": "Accept"
+        }
         
-        if not api_key:
-            logger.warning("NVD_API_KEY not set - API requests will be rate-limited")
+        # Binary msgpack for clients that ask for it; JSON otherwise
+        if MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+            return Response(
+                content=msgpack.packb(predictions),
+                media_type=MSGPACK_MEDIA_TYPE,
+                headers=headers
+            )
         
-        # Call existing pipeline function (reuse, don't modify)
-        results = process_new_cves(
+        response.headers.update(headers)
+        return predictions
+    
+    except Exception as e:
+        trace_id = secrets.token_hex(4)
+        logger.error(f"[{trace_id}] Error fetching latest CVEs: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail={"error": f"Failed to fetch CVEs from NVD: {str(e)}", "trace_id": trace_id}
+        )
+
+
+@app.get("/predict/latest-cves/stream")
+async def stream_latest_cves(
+    days_back: int = Query(default=3, ge=1, le=30, description="Number of days to look back (1-30)"),
+    max_results: int = Query(default=10, ge=1, le=100, description="Maximum number of CVEs to fetch (1-100)")
+):
+    """
+    Fetch recent CVEs from NVD and stream predictions as NDJSON.
+    
+    Same data as `GET /predict/latest-cves`, but each prediction is sent
+    as one JSON object per line (`application/x-ndjson`) as soon as it is
+    computed, so clients can render results progressively.
+    
+    **Example Response:**
+    ```
+    {"cve_id": "CVE-2024-1234", "risk": "HIGH", "risk_code": 2, "confidence": 0.89, "anomalous": false}
+    {"cve_id": "CVE-2024-5678", "risk": "LOW", "risk_code": 0, "confidence": 0.72, "anomalous": false}
+    ```
+    """
+    try:
+        # Fetch before streaming starts so NVD failures still map to a 502
+        cves = await fetch_cves_from_nvd_async(
+            app.state.http_client,
             days_back=days_back,
             max_results=max_results,
-            api_key=api_key
+            api_key=os.getenv("NVD_API_KEY")
         )
-        
-        # Convert to response format
-        # The process_new_cves function already returns the correct structure
-        return [
-            CVEPrediction(
-                cve_id=result["cve_id"],
-                risk=result["risk"],
-                confidence=float(result["confidence"]),
-                anomalous=bool(result["anomalous"])
-            )
-            for result in results
-        ]
     
     except Exception as e:
-        trace_id = str(uuid.uuid4())[:8]
+        trace_id = secrets.token_hex(4)
         logger.error(f"[{trace_id}] Error fetching latest CVEs: {e}")
         raise HTTPException(
             status_code=502,
             detail={"error": f"Failed to fetch CVEs from NVD: {str(e)}", "trace_id": trace_id}
         )
+    
+    # Each batch is scored on the inference pool under the concurrency limit,
+    # like /predict. Small batches keep time-to-first-line low while still
+    # vectorizing in bulk.
+    async def stream_predictions():
+        for start in range(0, len(cves), STREAM_BATCH_SIZE):
+            results = await _run_inference(
+                predict_cve_batch, cves[start:start + STREAM_BATCH_SIZE], start, len(cves)
+            )
+            for result in results:
+                yield orjson.dumps(result) + b"\n"
+    
+    return StreamingResponse(stream_predictions(), media_type="application/x-ndjson")
+
+
+# --- Cache Statistics Endpoint ---
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Prediction cache statistics for observability.
+    
+    Returns:
+    - `hits` / `misses` / `hit_rate`: /predict lookups served from / missing
+      the response cache
+    - `maxsize`: Maximum number of cached descriptions
+    - `currsize`: Number of descriptions currently cached
+    - `models`: The same counters for the processor's per-model result
+      caches (`risk`, `anomaly`), shared with scripts and the pipeline
+    """
+    return {
+        **_predict_cache.stats(),
+        "models": result_cache_stats()
+    }
 
 
 # --- Health Check Endpoint ---
@@ -335,9 +736,9 @@ async def health_check():
     - `status`: "healthy" if all models are loaded
     - `models_loaded`: true/false
     """
-    # Check if models are accessible
-    required_files = ["rf_model.pkl", "tfidf_vectorizer.pkl", "anomaly_model.pkl"]
-    models_loaded = all(os.path.exists(f) for f in required_files)
+    # Startup aborts if models are missing, so this is a cached flag
+    # rather than a filesystem check on every probe
+    models_loaded = getattr(app.state, "models_loaded", False)
     
     return {
         "status": "healthy" if models_loaded else "unhealthy",
@@ -346,6 +747,11 @@ async def health_check():
 
 
 # --- Run Server ---
-# Start with: uvicorn app:app --reload
+# Development: uvicorn app:app --reload
+# Production:  uvicorn app:app --loop uvloop --http httptools --workers $(nproc)
+#              (uvloop and httptools ship with uvicorn[standard]; uvloop is not
+#              available on Windows, where the default asyncio loop is used)
+# Multi-core:  gunicorn app:app -c gunicorn.conf.py
+#              (preloads models once and forks workers that share them)
 # Access at: http://127.0.0.1:8000
 # Docs at: http://127.0.0.1:8000/docs
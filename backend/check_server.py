@@ -5,7 +5,8 @@ Checks if the FastAPI server is running on port 8000
 """
 
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://127.0.0.1:8000"
 
@@ -13,21 +14,25 @@ def check_server():
     """Check if server is accessible"""
     print("🔍 Checking if FastAPI server is running...")
     
-    max_attempts = 5
-    for attempt in range(1, max_attempts + 1):
-        try:
-            response = requests.get(f"{BASE_URL}/", timeout=2)
-            if response.status_code == 200:
-                print(f"✅ Server is running!")
-                print(f"📡 API URL: {BASE_URL}")
-                print(f"📚 Interactive docs: {BASE_URL}/docs")
-                print(f"\nResponse from root endpoint:")
-                print(response.json())
-                return True
-        except requests.RequestException as e:
-            print(f"Attempt {attempt}/{max_attempts}: Server not ready... ({e.__class__.__name__})")
-            if attempt < max_attempts:
-                time.sleep(2)
+    # One keep-alive session; urllib3 retries refused connections and
+    # gateway errors with exponential backoff (up to 5 attempts)
+    session = requests.Session()
+    retries = Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    session.mount("http://", HTTPAdapter(max_retries=retries))
+    
+    try:
+        response = session.get(f"{BASE_URL}/", timeout=2)
+        if response.status_code == 200:
+            print(f"✅ Server is running!")
+            print(f"📡 API URL: {BASE_URL}")
+            print(f"📚 Interactive docs: {BASE_URL}/docs")
+            print(f"\nResponse from root endpoint:")
+            print(response.json())
+            return True
+    except requests.RequestException as e:
+        print(f"Server not ready after retries... ({e.__class__.__name__})")
+    finally:
+        session.close()
     
     print("\n❌ Server is not running or not accessible")
     print("💡 Start the server with: uvicorn app:app --reload")
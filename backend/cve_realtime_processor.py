@@ -13,12 +13,48 @@ Constraints:
 """
 
 import os
-import json
+import asyncio
+import hashlib
 import logging
+import time
+import threading
 import joblib
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache, partial
+import httpx
+import ijson
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Iterator, List, Dict, NamedTuple, Optional, Tuple
+
+try:
+    import diskcache
+except ImportError:
+    # Persistent prediction cache is optional; predictions still work without it
+    diskcache = None
+
+try:
+    import re2
+except ImportError:
+    # google-re2 is optional; sklearn's default re tokenizer is used without it
+    re2 = None
+
+try:
+    import redis
+except ImportError:
+    # Shared Redis result cache is optional; the in-process LRU is used without it
+    redis = None
+
+try:
+    import onnxruntime
+except ImportError:
+    # ONNX Runtime is optional; sklearn predict_proba is used without it
+    onnxruntime = None
 
 # Load environment variables from .env file
 try:
@@ -39,23 +75,573 @@ logger = logging.getLogger(__name__)
 
 # --- Constants ---
 NVD_API_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+NVD_MAX_PAGE_SIZE = 2000  # NVD caps resultsPerPage at 2000
+# NVD rolling-window rate limits (5 req/30s anonymous, 50 req/30s with a key)
+# expressed as (concurrent requests, seconds each slot waits after a request)
+NVD_RATE_LIMIT_ANONYMOUS = (1, 6.0)
+NVD_RATE_LIMIT_WITH_KEY = (5, 3.0)
+NVD_RETRY_STATUSES = (429, 503)  # Throttled / overloaded: back off and retry
+NVD_MAX_RETRIES = 3
+NVD_RETRY_BACKOFF = 2.0  # seconds, doubled on each retry
 MODEL_PATH = "rf_model.pkl"
 VECTORIZER_PATH = "tfidf_vectorizer.pkl"
+TFIDF_TRANSFORMER_PATH = "tfidf_transformer.pkl"  # Hashing variant: IDF vector only
 ANOMALY_MODEL_PATH = "anomaly_model.pkl"
+SKLEARN_TOKEN_PATTERN = r"(?u)\b\w\w+\b"  # sklearn's default word token pattern
+RF_ONNX_PATH = "rf_model.onnx"  # Optional ONNX export of rf_model.pkl (see export_onnx.py)
+TRANSFORM_CACHE_SIZE = 4096  # Distinct descriptions whose TF-IDF rows are memoized
+PREDICT_BATCH_SIZE = 256  # CVEs vectorized/scored per model call in the pipeline
+PREDICT_WORKERS = os.cpu_count() or 4  # Threads scoring batches in parallel
+ANOMALY_PARALLEL_MIN_ROWS = 1024  # Fan Isolation Forest scoring across threads from this size
+PREDICTION_CACHE_DIR = os.getenv("CVE_CACHE_DIR", ".cve_cache")
+PREDICTION_CACHE_SCHEMA = 2  # Bump when the cached result dict layout changes
+RESULT_CACHE_SIZE = 8192  # Descriptions whose risk/anomaly results are kept in memory
+REDIS_URL = os.getenv("REDIS_URL")  # Optional shared result cache (e.g. redis://localhost:6379/0)
+RESULT_CACHE_TTL = 86400  # seconds a result stays in Redis
+MAX_DESCRIPTION_LENGTH = 200_000  # Characters; longer input is rejected or truncated
+
+# Three-level risk mapping: MEDIUM is the buffer zone where the model is
+# uncertain or detects a moderate threat, between clearly LOW and clearly HIGH
+RISK_MEDIUM_THRESHOLD = 0.40
+RISK_HIGH_THRESHOLD = 0.70
+RISK_LABELS = np.array(["LOW", "MEDIUM", "HIGH"])
+# int8 risk codes (index into RISK_LABELS) for compact column arrays
+RISK_CODE_LOW, RISK_CODE_MEDIUM, RISK_CODE_HIGH = 0, 1, 2
+RISK_CODES = {"LOW": RISK_CODE_LOW, "MEDIUM": RISK_CODE_MEDIUM, "HIGH": RISK_CODE_HIGH}
+
+# --- NVD HTTP Session ---
+# One pooled keep-alive session so repeated sync fetches reuse a warm TLS
+# connection; retries with backoff cover NVD rate limiting (429) and 5xx
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+# --- Persistent Prediction Cache ---
+# (cve_id, lastModified) -> prediction dict, shared across runs and processes.
+# A CVE is only re-scored when NVD reports a newer lastModified for it.
+_prediction_cache = None
+if diskcache is not None:
+    try:
+        _prediction_cache = diskcache.Cache(PREDICTION_CACHE_DIR)
+    except Exception as e:
+        logger.warning(f"Prediction disk cache disabled ({PREDICTION_CACHE_DIR}): {e}")
+
+
+def _prediction_cache_key(cve: Dict[str, str]) -> Optional[str]:
+    """
+    Disk cache key for a fetched CVE, or None if it cannot be cached.
+    Includes the model fingerprint, so a retrain re-scores every CVE.
+    """
+    if _prediction_cache is None or not cve.get("last_modified"):
+        return None
+    fingerprint = load_models().fingerprint
+    return f"v{PREDICTION_CACHE_SCHEMA}|{fingerprint}|{cve['cve_id']}|{cve['last_modified']}"
+
+
+# --- In-Memory Result Cache ---
+
+class DigestLRUCache:
+    """
+    Thread-safe LRU cache keyed by a BLAKE2b digest of the description,
+    so long descriptions are not kept alive as dict keys. Tracks hit/miss
+    counts for observability.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(description: str) -> bytes:
+        """Cache key for a description (surrounding whitespace ignored)."""
+        return hashlib.blake2b(description.strip().encode("utf-8"), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value (refreshing its LRU position), or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+    
+    def put(self, key: bytes, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "maxsize": self.maxsize,
+                "currsize": len(self._data)
+            }
+
+
+class RedisResultCache(DigestLRUCache):
+    """
+    DigestLRUCache with a shared Redis tier behind it (cache-aside), so API
+    workers and batch jobs reuse each other's results. Local misses fall
+    through to Redis and are promoted; Redis errors and undecodable entries
+    degrade to a miss. Redis keys carry the model fingerprint, so workers on
+    a retrained model never read results scored by the old one.
+    clear() only empties the local tier.
+    """
+    
+    def __init__(self, maxsize: int, client: "redis.Redis", prefix: str, ttl: int = RESULT_CACHE_TTL):
+        super().__init__(maxsize)
+        self._redis = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.redis_hits = 0
+    
+    def _redis_key(self, key: bytes) -> str:
+        return f"{self.prefix}{load_models().fingerprint}:{key.hex()}"
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        value = super().get(key)
+        if value is not None:
+            return value
+        
+        try:
+            raw = self._redis.get(self._redis_key(key))
+        except redis.RedisError as e:
+            logger.debug("Redis GET failed: %s", e)
+            return None
+        if raw is None:
+            return None
+        
+        try:
+            value = orjson.loads(raw)
+        except orjson.JSONDecodeError as e:
+            logger.debug("Redis entry undecodable, recomputing: %s", e)
+            return None
+        with self._lock:
+            self.redis_hits += 1
+        super().put(key, value)
+        return value
+    
+    def put(self, key: bytes, value: Any) -> None:
+        super().put(key, value)
+        try:
+            self._redis.setex(self._redis_key(key), self.ttl, orjson.dumps(value))
+        except redis.RedisError as e:
+            logger.debug("Redis SETEX failed: %s", e)
+    
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["redis_hits"] = self.redis_hits
+        return stats
+
+
+def _connect_redis() -> Optional["redis.Redis"]:
+    """Redis client for REDIS_URL, or None if unset, unavailable or unreachable."""
+    if not REDIS_URL or redis is None:
+        return None
+    
+    try:
+        client = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        client.ping()
+        logger.info("✓ Shared result cache: Redis")
+        return client
+    except redis.RedisError as e:
+        logger.warning(f"Redis result cache disabled ({e}); using in-process cache only")
+        return None
+
+
+def _make_result_cache(prefix: str) -> DigestLRUCache:
+    """Per-model result cache: Redis-backed when REDIS_URL is reachable."""
+    if _redis_client is not None:
+        return RedisResultCache(RESULT_CACHE_SIZE, _redis_client, prefix)
+    return DigestLRUCache(RESULT_CACHE_SIZE)
+
+
+# Single-description results: CVE feeds repeat vendor boilerplate and demo /
+# test scripts re-score identical strings, so repeats skip TF-IDF + models
+_redis_client = _connect_redis()
+_risk_cache = _make_result_cache("pr:")
+_anomaly_cache = _make_result_cache("ad:")
+
+
+def result_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss statistics for the predict_risk / detect_anomaly caches."""
+    return {"risk": _risk_cache.stats(), "anomaly": _anomaly_cache.stats()}
+
 
 # --- Global Model Instances ---
-# Loaded once at module import
-try:
-    clf = joblib.load(MODEL_PATH)
-    vectorizer = joblib.load(VECTORIZER_PATH)
-    anomaly_clf = joblib.load(ANOMALY_MODEL_PATH)
-    logger.info("✓ Models loaded successfully")
-except FileNotFoundError as e:
-    logger.error(f"✗ Model file not found: {e}")
-    clf, vectorizer, anomaly_clf = None, None, None
-except Exception as e:
-    logger.error(f"✗ Error loading models: {e}")
-    clf, vectorizer, anomaly_clf = None, None, None
+# Loaded lazily on first use (or eagerly via load_models()) and then kept for
+# the life of the process, so importing this module for NVD fetching alone
+# pays no unpickling cost.
+
+def _load_model(path: str, mmap_mode: Optional[str] = "r"):
+    """
+    Load a pickled model and log how long deserialization took.
+    
+    mmap_mode="r" maps the NumPy arrays stored in uncompressed joblib
+    files straight from the page cache instead of copying them onto the
+    heap, so forked workers share one physical copy. sklearn's Tree
+    objects still copy their node arrays on unpickle; the saving applies
+    to plain ndarray attributes (IDF vectors, estimator metadata).
+    
+    Args:
+        path (str): joblib file to load
+        mmap_mode (str, optional): Pass None for compressed files, which
+            cannot be memory-mapped (joblib warns and ignores the flag)
+    """
+    start = time.perf_counter()
+    model = joblib.load(path, mmap_mode=mmap_mode)
+    logger.info(f"  Loaded {path} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return model
+
+
+def _load_vectorizer():
+    """
+    Load the TF-IDF stage. A pickled TfidfTransformer (models trained on
+    hashed features) is preferred over the fitted TfidfVectorizer: it
+    carries no vocabulary dict, so it loads faster and uses less RSS per
+    worker.
+    """
+    if os.path.exists(TFIDF_TRANSFORMER_PATH):
+        from text_features import load_hashing_vectorizer
+        
+        start = time.perf_counter()
+        vectorizer = load_hashing_vectorizer(TFIDF_TRANSFORMER_PATH)
+        logger.info(f"  Loaded {TFIDF_TRANSFORMER_PATH} (hashing) in {(time.perf_counter() - start) * 1000:.0f} ms")
+    else:
+        vectorizer = _load_model(VECTORIZER_PATH)
+    
+    _install_fast_tokenizer(vectorizer)
+    return _FastTfidfVectorizer.wrap(vectorizer)
+
+
+def _install_fast_tokenizer(vectorizer) -> None:
+    """
+    Swap the word tokenizer for an RE2 (linear-time, non-backtracking)
+    compile of the same pattern when google-re2 is installed.
+    
+    Only applied to word analyzers still on sklearn's default token
+    pattern with no custom tokenizer, so the produced tokens (and thus the
+    features) are unchanged; lowercasing and stop-word removal still run
+    in sklearn's analyzer around it.
+    """
+    if re2 is None:
+        return
+    
+    # Hashing pipeline: the tokenizing step is the first one
+    text_step = vectorizer.steps[0][1] if hasattr(vectorizer, "steps") else vectorizer
+    
+    if (
+        getattr(text_step, "analyzer", None) != "word"
+        or getattr(text_step, "tokenizer", "custom") is not None
+        or getattr(text_step, "token_pattern", None) != SKLEARN_TOKEN_PATTERN
+    ):
+        return
+    
+    # RE2's \w and \b are ASCII-only; a run of 2+ Unicode letters/digits/_
+    # is the same maximal-run match as Python's (?u)\b\w\w+\b
+    text_step.tokenizer = re2.compile(r"[\p{L}\p{N}_]{2,}").findall
+    logger.info("  Using RE2 tokenizer for TF-IDF")
+
+
+class _FastTfidfVectorizer:
+    """
+    transform()-compatible wrapper around a fitted TfidfVectorizer (or the
+    HashingVectorizer -> TfidfTransformer pipeline) that applies the IDF
+    weighting itself with a frozen float32 IDF vector.
+    
+    sklearn's TfidfTransformer re-validates and multiplies through a float64
+    sparse diagonal matrix on every call; here the counts' data array is
+    scaled in place by idf[indices] and L2-normalized, all in float32. For
+    the hashing pipeline this also halves the 2^20-entry IDF vector.
+    Every other attribute is delegated to the wrapped vectorizer.
+    """
+    
+    def __init__(self, vectorizer):
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        self._vectorizer = vectorizer
+        if hasattr(vectorizer, "steps"):
+            # Hashing pipeline: stateless counts, then the fitted IDF stage
+            self._counts = vectorizer.steps[0][1].transform
+            weighting = vectorizer.steps[-1][1]
+        else:
+            # Raw term counts from the fitted vocabulary (skips TfidfTransformer)
+            self._counts = partial(CountVectorizer.transform, vectorizer)
+            weighting = vectorizer
+        self._norm = weighting.norm
+        self._idf = np.ascontiguousarray(weighting.idf_, dtype=np.float32)
+    
+    @classmethod
+    def wrap(cls, vectorizer):
+        """Wrap vectorizer if it uses the plain TF-IDF settings handled here."""
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+        
+        if hasattr(vectorizer, "steps"):
+            steps = [step for _, step in vectorizer.steps]
+            if (
+                len(steps) != 2
+                or type(steps[0]) is not HashingVectorizer
+                or steps[0].norm is not None
+                or type(steps[1]) is not TfidfTransformer
+            ):
+                return vectorizer
+            weighting = steps[1]
+        elif type(vectorizer) is TfidfVectorizer:
+            weighting = vectorizer
+        else:
+            return vectorizer
+        
+        if not weighting.use_idf or weighting.sublinear_tf or weighting.norm not in ("l2", None):
+            return vectorizer
+        return cls(vectorizer)
+    
+    def transform(self, raw_documents):
+        from sklearn.preprocessing import normalize
+        
+        X = self._counts(raw_documents).astype(np.float32)
+        X.data *= self._idf[X.indices]
+        if self._norm == "l2":
+            normalize(X, norm="l2", copy=False)
+        return X
+    
+    def __getattr__(self, name):
+        return getattr(self._vectorizer, name)
+
+
+def missing_model_files() -> List[str]:
+    """
+    List required model artifacts that are not on disk. Either vectorizer
+    artifact (fitted TfidfVectorizer or hashing TfidfTransformer) satisfies
+    the vectorizer requirement.
+    """
+    # Artifacts are bare filenames in the working directory: one directory
+    # read instead of a stat() per file (noticeable on network filesystems)
+    with os.scandir(".") as entries:
+        present = {entry.name for entry in entries}
+    
+    missing = [path for path in (MODEL_PATH, ANOMALY_MODEL_PATH) if path not in present]
+    if TFIDF_TRANSFORMER_PATH not in present and VECTORIZER_PATH not in present:
+        missing.append(VECTORIZER_PATH)
+    return missing
+
+
+def _load_onnx_session():
+    """
+    Open an ONNX Runtime session for the exported Random Forest, or return
+    None (sklearn fallback) if onnxruntime or the export is unavailable.
+    """
+    if onnxruntime is None or not os.path.exists(RF_ONNX_PATH):
+        return None
+    
+    try:
+        start = time.perf_counter()
+        session = onnxruntime.InferenceSession(RF_ONNX_PATH, providers=["CPUExecutionProvider"])
+        logger.info(f"  Loaded {RF_ONNX_PATH} (onnxruntime) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return session
+    except Exception as e:
+        logger.warning(f"Could not load {RF_ONNX_PATH}, using sklearn predict_proba: {e}")
+        return None
+
+
+class Models(NamedTuple):
+    """Loaded model instances; any of them is None if loading failed."""
+    clf: Any
+    vectorizer: Any
+    anomaly_clf: Any
+    rf_session: Any
+    fingerprint: str  # Digest of the artifacts loaded (see _model_fingerprint())
+
+
+_models_lock = threading.Lock()
+
+
+def load_models() -> Models:
+    """
+    Return the loaded models, deserializing them on the first call.
+    
+    Thread-safe: concurrent first calls load once. Load failures are
+    logged and cached as None models (same as a failed import-time load),
+    so callers see "Models not loaded" instead of retrying every request.
+    
+    Returns:
+        Models: (clf, vectorizer, anomaly_clf, rf_session, fingerprint)
+    """
+    with _models_lock:
+        return _load_models_once()
+
+
+def _model_fingerprint() -> str:
+    """
+    Short digest of the model artifacts on disk (name, size, mtime), so
+    caches that outlive the process key each result to the model that
+    produced it and a retrain starts from a cold cache.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for path in (MODEL_PATH, VECTORIZER_PATH, TFIDF_TRANSFORMER_PATH, ANOMALY_MODEL_PATH, RF_ONNX_PATH):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+@cache
+def _load_models_once() -> Models:
+    # Taken before loading so a retrain racing the load changes it
+    fingerprint = _model_fingerprint()
+    try:
+        clf = _load_model(MODEL_PATH, mmap_mode=None)  # Saved with compress=3 (see train_model.py)
+        vectorizer = _load_vectorizer()
+        anomaly_clf = _load_model(ANOMALY_MODEL_PATH)
+        logger.info("✓ Models loaded successfully")
+    except FileNotFoundError as e:
+        logger.error(f"✗ Model file not found: {e}")
+        return Models(None, None, None, None, fingerprint)
+    except Exception as e:
+        logger.error(f"✗ Error loading models: {e}")
+        return Models(None, None, None, None, fingerprint)
+    
+    models = Models(clf, vectorizer, anomaly_clf, _load_onnx_session(), fingerprint)
+    
+    if os.environ.get("CVE_WARMUP", "1") == "1":
+        _warm_up(models)
+    
+    if os.environ.get("CVE_MLOCK") == "1":
+        _lock_resident_memory()
+    
+    return models
+
+
+def _warm_up(models: Models) -> None:
+    """
+    Run one throwaway transform + prediction through every model so
+    first-touch costs (Cython module init, BLAS/OpenMP thread pools,
+    mmap page-in) are paid at load time, not by the first real request.
+    Disable with CVE_WARMUP=0.
+    """
+    start = time.perf_counter()
+    try:
+        X_warmup = _transform(models.vectorizer, ["warm-up buffer overflow allows remote code execution"])
+        if models.rf_session is not None:
+            models.rf_session.run(None, {models.rf_session.get_inputs()[0].name: X_warmup.toarray()})
+        else:
+            _sklearn_predict_proba(models.clf, X_warmup)
+        models.anomaly_clf.decision_function(X_warmup)
+        logger.info(f"  Warmed up models in {(time.perf_counter() - start) * 1000:.0f} ms")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed (first prediction will be slower): {e}")
+
+
+def _lock_resident_memory() -> None:
+    """
+    mlockall(MCL_CURRENT) the loaded (and warmed, so paged-in) models so
+    the kernel cannot evict their pages under memory pressure. Opt-in with
+    CVE_MLOCK=1; needs CAP_IPC_LOCK or a large enough RLIMIT_MEMLOCK, and
+    only applies on Linux. Under gunicorn preload_app the master holds the
+    lock, which keeps the shared mmap'd model pages resident for workers.
+    """
+    import ctypes
+    import ctypes.util
+    
+    MCL_CURRENT = 1
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.mlockall(MCL_CURRENT) != 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        logger.info("  Locked model memory (mlockall)")
+    except (OSError, AttributeError) as e:
+        logger.warning(f"Could not lock model memory: {e}")
+
+
+def __getattr__(name: str):
+    """
+    Keep the old module-level names (cve_realtime_processor.clf, ...)
+    working; accessing one triggers the lazy load.
+    """
+    if name in Models._fields and name != "fingerprint":
+        return getattr(load_models(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Classifiers train_model.py can produce that reject sparse input
+_DENSE_INPUT_CLASSIFIERS = ("HistGradientBoostingClassifier",)
+
+
+def _sklearn_predict_proba(clf, X_transformed):
+    """clf.predict_proba(), densifying first for dense-only classifiers."""
+    if type(clf).__name__ in _DENSE_INPUT_CLASSIFIERS:
+        X_transformed = X_transformed.toarray()
+    return clf.predict_proba(X_transformed)
+
+
+def _predict_proba(X_transformed):
+    """
+    Class probabilities for a feature matrix, from ONNX Runtime's fused
+    C++ tree kernels when an export is loaded, else sklearn.
+    
+    Column order matches clf.classes_ either way.
+    """
+    models = load_models()
+    clf, rf_session = models.clf, models.rf_session
+    
+    if rf_session is None:
+        return _sklearn_predict_proba(clf, X_transformed)
+    
+    # TreeEnsembleClassifier takes a dense float32 tensor; outputs are
+    # [labels, probabilities] (exported with zipmap disabled)
+    features = X_transformed.toarray().astype(np.float32, copy=False)
+    return rf_session.run(None, {rf_session.get_inputs()[0].name: features})[1]
+
+
+def _transform(vectorizer, descriptions: List[str]):
+    """
+    vectorizer.transform() with the result downcast to float32.
+    
+    Both forests compare features against float32 split thresholds and
+    would convert float64 input internally on every call; casting once
+    here halves the bytes the tree kernels read and skips those copies.
+    TF-IDF weights are L2-normalized, well within float32 precision.
+    """
+    return vectorizer.transform(descriptions).astype(np.float32, copy=False)
+
+
+@lru_cache(maxsize=TRANSFORM_CACHE_SIZE)
+def _cached_transform(description: str):
+    """
+    Memoized vectorizer.transform([description]).
+    
+    Repeat descriptions (demos, tests, overlapping NVD windows) skip
+    tokenization, vocabulary lookup and IDF weighting. The returned CSR
+    matrix is shared between callers and must not be modified in place.
+    Call _cached_transform.cache_clear() if the vectorizer is reloaded.
+    """
+    return _transform(load_models().vectorizer, [description])
 
 
 def predict_risk(description: str) -> Dict[str, any]:
@@ -76,6 +662,7 @@ def predict_risk(description: str) -> Dict[str, any]:
     Returns:
         dict: {
             "risk": "HIGH" | "MEDIUM" | "LOW",
+            "risk_code": int (RISK_CODES value: 2=HIGH, 1=MEDIUM, 0=LOW),
             "confidence": float (0.0 to 1.0),
             "prediction_class": int (1=HIGH, 0=LOW from original binary model)
         }
@@ -83,38 +670,31 @@ def predict_risk(description: str) -> Dict[str, any]:
     Raises:
         ValueError: If models are not loaded
     """
+    models = load_models()
+    clf, vectorizer = models.clf, models.vectorizer
     if not clf or not vectorizer:
         raise ValueError("Models not loaded. Cannot perform prediction.")
     
-    # Transform input using pre-trained vectorizer (NO retraining)
-    X_transformed = vectorizer.transform([description])
-    
-    # Predict using trained binary classifier (NO modification)
-    prediction_class = clf.predict(X_transformed)[0]
-    probabilities = clf.predict_proba(X_transformed)[0]
-    
-    # Get probability of HIGH risk class (class 1)
-    # For binary classifier: probabilities[0] = P(LOW), probabilities[1] = P(HIGH)
-    high_risk_probability = float(probabilities[1])
-    
-    # --- Three-Level Risk Mapping ---
-    # MEDIUM risk represents cases where the model is uncertain or detects moderate threat.
-    # This provides a buffer zone between clearly HIGH and clearly LOW risk CVEs.
-    if high_risk_probability >= 0.70:
-        risk_level = "HIGH"
-        confidence = high_risk_probability  # Confidence in HIGH classification
-    elif high_risk_probability >= 0.40:
-        risk_level = "MEDIUM"
-        confidence = high_risk_probability  # Reflects moderate risk probability
-    else:
-        risk_level = "LOW"
-        confidence = 1.0 - high_risk_probability  # Confidence in LOW classification
+    key = DigestLRUCache.key(description)
+    cached = _risk_cache.get(key)
+    if cached is not None:
+        return dict(cached)  # Copy so callers cannot mutate the cached entry
     
-    return {
-        "risk": risk_level,
-        "confidence": confidence,
-        "prediction_class": int(prediction_class)
-    }
+    # Transform input using pre-trained vectorizer (NO retraining, memoized)
+    X_transformed = _cached_transform(description)
+    
+    risk_result = _predict_risk_from_features(X_transformed)
+    _risk_cache.put(key, risk_result)
+    return dict(risk_result)
+
+
+def _predict_risk_from_features(X_transformed) -> Dict[str, any]:
+    """
+    Three-level risk mapping for an already vectorized description.
+    See predict_risk() for the thresholds.
+    """
+    # Same vectorized kernel as the batch path, over a one-row matrix
+    return _predict_risk_batch_from_features(X_transformed)[0]
 
 
 def detect_anomaly(description: str) -> Dict[str, any]:
@@ -129,40 +709,314 @@ def detect_anomaly(description: str) -> Dict[str, any]:
     - Mix anomaly score with risk probability
     - Retrain the vectorizer
     
-    Args:
-        description (str): CVE vulnerability description text
+    Args:
+        description (str): CVE vulnerability description text
+    
+    Returns:
+        dict: {
+            "anomalous": bool (True if anomalous),
+            "anomaly_score": float (lower = more anomalous),
+            "threshold_info": str
+        }
+    
+    Raises:
+        ValueError: If anomaly model is not loaded
+    """
+    models = load_models()
+    anomaly_clf, vectorizer = models.anomaly_clf, models.vectorizer
+    if not anomaly_clf or not vectorizer:
+        raise ValueError("Anomaly model or vectorizer not loaded.")
+    
+    key = DigestLRUCache.key(description)
+    cached = _anomaly_cache.get(key)
+    if cached is not None:
+        return dict(cached)  # Copy so callers cannot mutate the cached entry
+    
+    # Transform using same vectorizer (NO retraining, memoized)
+    X_transformed = _cached_transform(description)
+    
+    anomaly_result = _detect_anomaly_from_features(X_transformed)
+    _anomaly_cache.put(key, anomaly_result)
+    return dict(anomaly_result)
+
+
+def _detect_anomaly_from_features(X_transformed) -> Dict[str, any]:
+    """
+    Isolation Forest anomaly check for an already vectorized description.
+    See detect_anomaly() for the output format.
+    """
+    anomaly_clf = load_models().anomaly_clf
+    
+    # IsolationForest.predict() is -1 exactly where decision_function() < 0,
+    # so one forest pass gives both the score and the flag
+    anomaly_score = float(anomaly_clf.decision_function(X_transformed)[0])
+    
+    # Comparing the native float yields a Python bool (JSON-safe, not np.bool_)
+    is_anomalous = anomaly_score < 0
+    
+    # Provide context
+    threshold_info = "outside historical CVE patterns" if is_anomalous else "within normal patterns"
+    
+    return {
+        "anomalous": is_anomalous,  # Now a native Python bool (JSON-safe)
+        "anomaly_score": anomaly_score,  # Already converted to float above
+        "threshold_info": threshold_info
+    }
+
+
+def analyze_description(description: str) -> Tuple[Dict[str, any], Dict[str, any]]:
+    """
+    Run predict_risk() and detect_anomaly() on one description while
+    vectorizing it only once.
+    
+    Args:
+        description (str): CVE vulnerability description text
+    
+    Returns:
+        tuple: (risk_result, anomaly_result) in the same formats as
+        predict_risk() and detect_anomaly()
+    
+    Raises:
+        ValueError: If models are not loaded
+    """
+    models = load_models()
+    clf, vectorizer, anomaly_clf = models.clf, models.vectorizer, models.anomaly_clf
+    if not clf or not vectorizer or not anomaly_clf:
+        raise ValueError("Models not loaded. Cannot perform prediction.")
+    
+    key = DigestLRUCache.key(description)
+    risk_result = _risk_cache.get(key)
+    anomaly_result = _anomaly_cache.get(key)
+    
+    if risk_result is None or anomaly_result is None:
+        # Single (memoized) TF-IDF transform shared by both models
+        X_transformed = _cached_transform(description)
+        
+        if risk_result is None:
+            risk_result = _predict_risk_from_features(X_transformed)
+            _risk_cache.put(key, risk_result)
+        if anomaly_result is None:
+            anomaly_result = _detect_anomaly_from_features(X_transformed)
+            _anomaly_cache.put(key, anomaly_result)
+    
+    # Copies so callers cannot mutate the cached entries
+    return dict(risk_result), dict(anomaly_result)
+
+
+def predict_risk_batch(descriptions: List[str]) -> List[Dict[str, any]]:
+    """
+    Batched predict_risk(): one vectorizer.transform() and one classifier
+    call for all descriptions instead of one per description.
+    
+    Args:
+        descriptions (list): CVE vulnerability description texts
+    
+    Returns:
+        list: One predict_risk() result dict per description, in order
+    
+    Raises:
+        ValueError: If models are not loaded
+    """
+    models = load_models()
+    clf, vectorizer = models.clf, models.vectorizer
+    if not clf or not vectorizer:
+        raise ValueError("Models not loaded. Cannot perform prediction.")
+    
+    return _predict_risk_batch_from_features(_transform(vectorizer, descriptions))
+
+
+def _predict_risk_batch_from_features(X_transformed) -> List[Dict[str, any]]:
+    """
+    Vectorized three-level risk mapping over a batch feature matrix.
+    Same thresholds as predict_risk().
+    """
+    # Single forest pass; predict() would re-walk every tree for the argmax
+    probabilities = _predict_proba(X_transformed)
+    prediction_classes = load_models().clf.classes_[probabilities.argmax(axis=1)]
+    
+    # For binary classifier: probabilities[:, 0] = P(LOW), probabilities[:, 1] = P(HIGH)
+    high_risk_probabilities = probabilities[:, 1]
+    
+    # Branchless thresholding: 0 = LOW, 1 = MEDIUM, 2 = HIGH
+    idx = (
+        (high_risk_probabilities >= RISK_MEDIUM_THRESHOLD).astype(np.int8)
+        + (high_risk_probabilities >= RISK_HIGH_THRESHOLD).astype(np.int8)
+    )
+    risk_levels = RISK_LABELS[idx]
+    # Confidence is in the predicted direction: P(LOW) for LOW, P(HIGH) otherwise
+    confidences = np.where(idx == 0, 1.0 - high_risk_probabilities, high_risk_probabilities)
+    
+    # tolist() yields native Python str/float/int (JSON-safe)
+    return [
+        {
+            "risk": risk_level,
+            "risk_code": risk_code,
+            "confidence": confidence,
+            "prediction_class": prediction_class
+        }
+        for risk_level, risk_code, confidence, prediction_class in zip(
+            risk_levels.tolist(), idx.tolist(), confidences.tolist(),
+            prediction_classes.astype(int).tolist()
+        )
+    ]
+
+
+def detect_anomaly_batch(descriptions: List[str]) -> List[Dict[str, any]]:
+    """
+    Batched detect_anomaly(): one vectorizer.transform() and one Isolation
+    Forest call for all descriptions.
+    
+    Args:
+        descriptions (list): CVE vulnerability description texts
+    
+    Returns:
+        list: One detect_anomaly() result dict per description, in order
+    
+    Raises:
+        ValueError: If anomaly model is not loaded
+    """
+    models = load_models()
+    anomaly_clf, vectorizer = models.anomaly_clf, models.vectorizer
+    if not anomaly_clf or not vectorizer:
+        raise ValueError("Anomaly model or vectorizer not loaded.")
+    
+    return _detect_anomaly_batch_from_features(_transform(vectorizer, descriptions))
+
+
+def _detect_anomaly_batch_from_features(X_transformed) -> List[Dict[str, any]]:
+    """
+    Isolation Forest anomaly check over a batch feature matrix.
+    Same output format as detect_anomaly().
+    """
+    anomaly_clf = load_models().anomaly_clf
+    
+    # Single forest pass: predict() is -1 exactly where the score is < 0.
+    # Large matrices are scored with a threading joblib backend so sklearn
+    # versions that parallelize scoring use every core; small batches (the
+    # API and pipeline case, already parallel across batches) stay serial
+    if X_transformed.shape[0] >= ANOMALY_PARALLEL_MIN_ROWS:
+        with joblib.parallel_config(backend="threading", n_jobs=PREDICT_WORKERS):
+            anomaly_scores = anomaly_clf.decision_function(X_transformed)
+    else:
+        anomaly_scores = anomaly_clf.decision_function(X_transformed)
+    anomalous_flags = anomaly_scores < 0
+    
+    return [
+        {
+            "anomalous": is_anomalous,
+            "anomaly_score": anomaly_score,
+            "threshold_info": "outside historical CVE patterns" if is_anomalous else "within normal patterns"
+        }
+        for is_anomalous, anomaly_score in zip(anomalous_flags.tolist(), anomaly_scores.tolist())
+    ]
+
+
+def analyze_descriptions(
+    descriptions: List[str]
+) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+    """
+    Batched analyze_description(): vectorizes all descriptions once and
+    scores them with both models.
+    
+    Args:
+        descriptions (list): CVE vulnerability description texts
+    
+    Returns:
+        tuple: (risk_results, anomaly_results), each a list aligned with
+        descriptions
+    
+    Raises:
+        ValueError: If models are not loaded
+    """
+    models = load_models()
+    clf, vectorizer, anomaly_clf = models.clf, models.vectorizer, models.anomaly_clf
+    if not clf or not vectorizer or not anomaly_clf:
+        raise ValueError("Models not loaded. Cannot perform prediction.")
+    
+    # Single sparse matrix for the whole batch, shared by both models
+    X_transformed = _transform(vectorizer, descriptions)
+    
+    return (
+        _predict_risk_batch_from_features(X_transformed),
+        _detect_anomaly_batch_from_features(X_transformed)
+    )
+
+
+def _build_nvd_request(
+    days_back: int,
+    max_results: int,
+    api_key: Optional[str]
+) -> Tuple[Dict, Dict]:
+    """
+    Build NVD query parameters and headers for a publication date window.
+    
+    Returns:
+        tuple: (params, headers)
+    """
+    # Get API key from environment if not provided
+    if api_key is None:
+        api_key = os.getenv("NVD_API_KEY")
+        if not api_key:
+            logger.warning("NVD_API_KEY not found in environment. Proceeding without API key (rate limited).")
+    
+    # Calculate date range
+    end_date = datetime.utcnow()
+    start_date = end_date - timedelta(days=days_back)
+    
+    # NVD API expects ISO 8601 format with milliseconds
+    params = {
+        "pubStartDate": start_date.strftime("%Y-%m-%dT%H:%M:%S.000"),
+        "pubEndDate": end_date.strftime("%Y-%m-%dT%H:%M:%S.000"),
+        "resultsPerPage": max_results
+    }
+    
+    # Add API key header if available (increases rate limit)
+    headers = {}
+    if api_key:
+        headers["apiKey"] = api_key
     
-    Returns:
-        dict: {
-            "anomalous": bool (True if anomalous),
-            "anomaly_score": float (lower = more anomalous),
-            "threshold_info": str
-        }
+    logger.info(f"Fetching CVEs from {start_date.date()} to {end_date.date()}...")
     
-    Raises:
-        ValueError: If anomaly model is not loaded
+    return params, headers
+
+
+def _extract_cves(data: Dict) -> List[Dict[str, str]]:
     """
-    if not anomaly_clf or not vectorizer:
-        raise ValueError("Anomaly model or vectorizer not loaded.")
+    Extract CVE IDs and English descriptions from an NVD API response.
+    """
+    extracted_cves = []
     
-    # Transform using same vectorizer (NO retraining)
-    X_transformed = vectorizer.transform([description])
+    for item in data.get("vulnerabilities", []):
+        cve = _extract_cve(item)
+        if cve:
+            extracted_cves.append(cve)
     
-    # Predict anomaly: -1 = anomalous, 1 = normal
-    anomaly_prediction = anomaly_clf.predict(X_transformed)[0]
-    anomaly_score = float(anomaly_clf.decision_function(X_transformed)[0])
+    return extracted_cves
+
+
+def _extract_cve(item: Dict) -> Optional[Dict[str, str]]:
+    """
+    Extract the CVE ID and English description from one NVD
+    "vulnerabilities" entry, or None if it has no English description.
+    """
+    cve_obj = item.get("cve", {})
+    cve_id = cve_obj.get("id", "Unknown")
     
-    # Convert NumPy bool to Python bool for JSON serialization
-    # scikit-learn returns np.bool_ which is not JSON serializable
-    is_anomalous = bool(anomaly_prediction == -1)
+    # Extract English description
+    descriptions = cve_obj.get("descriptions", [])
+    desc_text = next(
+        (d["value"] for d in descriptions if d.get("lang") == "en"),
+        None
+    )
     
-    # Provide context
-    threshold_info = "outside historical CVE patterns" if is_anomalous else "within normal patterns"
+    if not desc_text:
+        logger.warning(f"No English description found for {cve_id}")
+        return None
     
     return {
-        "anomalous": is_anomalous,  # Now a native Python bool (JSON-safe)
-        "anomaly_score": anomaly_score,  # Already converted to float above
-        "threshold_info": threshold_info
+        "cve_id": cve_id,
+        "description": desc_text,
+        "last_modified": cve_obj.get("lastModified")
     }
 
 
@@ -183,7 +1037,8 @@ def fetch_cves_from_nvd(
         list: [
             {
                 "cve_id": "CVE-XXXX-YYYY",
-                "description": "English description text"
+                "description": "English description text",
+                "last_modified": "ISO 8601 timestamp" | None
             },
             ...
         ]
@@ -191,76 +1046,228 @@ def fetch_cves_from_nvd(
     Raises:
         requests.RequestException: If API request fails
     """
-    # Get API key from environment if not provided
-    if api_key is None:
-        api_key = os.getenv("NVD_API_KEY")
-        if not api_key:
-            logger.warning("NVD_API_KEY not found in environment. Proceeding without API key (rate limited).")
+    extracted_cves = list(iter_cves_from_nvd(days_back, max_results, api_key))
     
-    # Calculate date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days_back)
+    logger.info(f"✓ Fetched {len(extracted_cves)} CVEs successfully")
+    return extracted_cves
+
+
+def iter_cves_from_nvd(
+    days_back: int = 7,
+    max_results: int = 20,
+    api_key: Optional[str] = None
+) -> Iterator[Dict[str, str]]:
+    """
+    Stream CVEs from the NVD REST API one at a time.
     
-    # NVD API expects ISO 8601 format with milliseconds
-    params = {
-        "pubStartDate": start_date.strftime("%Y-%m-%dT%H:%M:%S.000"),
-        "pubEndDate": end_date.strftime("%Y-%m-%dT%H:%M:%S.000"),
-        "resultsPerPage": max_results
-    }
+    The response body is parsed incrementally with ijson, so only one
+    "vulnerabilities" entry is held in memory at a time instead of the
+    full (multi-MB at resultsPerPage=2000) JSON tree, and callers can
+    start predicting while bytes are still arriving.
     
-    # Add API key header if available (increases rate limit)
-    headers = {}
-    if api_key:
-        headers["apiKey"] = api_key
+    Args:
+        days_back (int): Number of days to look back (default: 7)
+        max_results (int): Maximum CVEs to fetch (default: 20)
+        api_key (str, optional): NVD API key from environment or parameter
     
-    logger.info(f"Fetching CVEs from {start_date.date()} to {end_date.date()}...")
+    Yields:
+        dict: {"cve_id", "description", "last_modified"} as in fetch_cves_from_nvd()
+    
+    Raises:
+        requests.RequestException: If API request fails
+        ijson.JSONError: If the response body is not valid JSON
+    """
+    params, headers = _build_nvd_request(days_back, max_results, api_key)
     
     try:
-        response = requests.get(
+        with _SESSION.get(
             NVD_API_URL,
             params=params,
             headers=headers,
-            timeout=30
-        )
-        response.raise_for_status()
-        data = response.json()
+            timeout=30,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            # Let urllib3 undo gzip/deflate before ijson sees the bytes
+            response.raw.decode_content = True
+            
+            for item in ijson.items(response.raw, "vulnerabilities.item"):
+                cve = _extract_cve(item)
+                if cve:
+                    yield cve
+    
+    except requests.RequestException as e:
+        logger.error(f"✗ Error fetching from NVD API: {e}")
+        raise
+    except ijson.JSONError as e:
+        logger.error(f"✗ Error parsing NVD API response: {e}")
+        raise
+
+
+async def fetch_cves_from_nvd_async(
+    client: httpx.AsyncClient,
+    days_back: int = 7,
+    max_results: int = 20,
+    api_key: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Async variant of fetch_cves_from_nvd() using a shared httpx client.
+    
+    Requests larger than one NVD page are split by startIndex and all
+    pages are fetched concurrently.
+    
+    Args:
+        client (httpx.AsyncClient): Shared client (connection pooling)
+        days_back (int): Number of days to look back (default: 7)
+        max_results (int): Maximum CVEs to fetch (default: 20)
+        api_key (str, optional): NVD API key from environment or parameter
+    
+    Returns:
+        list: Same structure as fetch_cves_from_nvd()
+    
+    Raises:
+        httpx.HTTPError: If any page request fails
+    """
+    params, headers = _build_nvd_request(days_back, max_results, api_key)
+    
+    page_params = [
+        {
+            **params,
+            "startIndex": start,
+            "resultsPerPage": min(NVD_MAX_PAGE_SIZE, max_results - start)
+        }
+        for start in range(0, max_results, NVD_MAX_PAGE_SIZE)
+    ]
+    
+    try:
+        responses = await asyncio.gather(*[
+            client.get(NVD_API_URL, params=page, headers=headers)
+            for page in page_params
+        ])
         
-        # Extract CVE data
-        cve_items = data.get("vulnerabilities", [])
         extracted_cves = []
+        for response in responses:
+            response.raise_for_status()
+            extracted_cves.extend(_extract_cves(orjson.loads(response.content)))
         
-        for item in cve_items:
-            cve_obj = item.get("cve", {})
-            cve_id = cve_obj.get("id", "Unknown")
+        logger.info(f"✓ Fetched {len(extracted_cves)} CVEs successfully")
+        return extracted_cves
+    
+    except httpx.HTTPError as e:
+        logger.error(f"✗ Error fetching from NVD API: {e}")
+        raise
+
+
+async def fetch_cves_paginated_async(
+    client: httpx.AsyncClient,
+    days_back: int = 7,
+    max_results: Optional[int] = None,
+    api_key: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Fetch every CVE in the window (or the first max_results) across as many
+    NVD pages as needed, with rate-limit-bounded concurrency.
+    
+    The first page reports totalResults; the remaining startIndex pages are
+    then fetched concurrently, gated by a semaphore and a per-slot delay that
+    keep the request rate within NVD's published limits.
+    
+    Args:
+        client (httpx.AsyncClient): Shared client (connection pooling)
+        days_back (int): Number of days to look back (default: 7)
+        max_results (int, optional): Cap on CVEs to fetch (default: all)
+        api_key (str, optional): NVD API key from environment or parameter
+    
+    Returns:
+        list: Same structure as fetch_cves_from_nvd()
+    
+    Raises:
+        httpx.HTTPError: If any page request fails
+    """
+    api_key = api_key or os.getenv("NVD_API_KEY")
+    params, headers = _build_nvd_request(days_back, NVD_MAX_PAGE_SIZE, api_key)
+    
+    concurrency, delay = NVD_RATE_LIMIT_WITH_KEY if api_key else NVD_RATE_LIMIT_ANONYMOUS
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_page(start: int) -> Dict:
+        for attempt in range(NVD_MAX_RETRIES + 1):
+            async with semaphore:
+                try:
+                    response = await client.get(
+                        NVD_API_URL,
+                        params={**params, "startIndex": start},
+                        headers=headers
+                    )
+                finally:
+                    # Hold the slot a little longer so the rolling window never overflows
+                    await asyncio.sleep(delay)
             
-            # Extract English description
-            descriptions = cve_obj.get("descriptions", [])
-            desc_text = next(
-                (d["value"] for d in descriptions if d.get("lang") == "en"),
-                None
-            )
+            if response.status_code in NVD_RETRY_STATUSES and attempt < NVD_MAX_RETRIES:
+                backoff = NVD_RETRY_BACKOFF * 2 ** attempt
+                logger.warning(f"NVD returned {response.status_code} for startIndex={start}; retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                continue
             
-            if desc_text:
-                extracted_cves.append({
-                    "cve_id": cve_id,
-                    "description": desc_text
-                })
-            else:
-                logger.warning(f"No English description found for {cve_id}")
+            response.raise_for_status()
+            return orjson.loads(response.content)
+    
+    try:
+        first_page = await fetch_page(0)
+        total = first_page.get("totalResults", 0)
+        if max_results is not None:
+            total = min(total, max_results)
         
-        logger.info(f"✓ Fetched {len(extracted_cves)} CVEs successfully")
-        return extracted_cves
+        logger.info(f"NVD reports {first_page.get('totalResults', 0)} CVEs; fetching {total}")
+        
+        pages = [first_page] + await asyncio.gather(*[
+            fetch_page(start)
+            for start in range(NVD_MAX_PAGE_SIZE, total, NVD_MAX_PAGE_SIZE)
+        ])
     
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"✗ Error fetching from NVD API: {e}")
         raise
+    
+    extracted_cves = []
+    for page in pages:
+        extracted_cves.extend(_extract_cves(page))
+    extracted_cves = extracted_cves[:total]
+    
+    logger.info(f"✓ Fetched {len(extracted_cves)} CVEs successfully")
+    return extracted_cves
+
+
+def fetch_cves_from_nvd_paginated(
+    days_back: int = 7,
+    max_results: Optional[int] = None,
+    api_key: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Blocking wrapper around fetch_cves_paginated_async() for scripts and
+    backfills outside an event loop.
+    
+    Args:
+        days_back (int): Number of days to look back (default: 7)
+        max_results (int, optional): Cap on CVEs to fetch (default: all)
+        api_key (str, optional): NVD API key from environment or parameter
+    
+    Returns:
+        list: Same structure as fetch_cves_from_nvd()
+    """
+    async def run() -> List[Dict[str, str]]:
+        async with httpx.AsyncClient(http2=True, timeout=30) as client:
+            return await fetch_cves_paginated_async(client, days_back, max_results, api_key)
+    
+    return asyncio.run(run())
 
 
 def process_new_cves(
     days_back: int = 7,
     max_results: int = 20,
-    api_key: Optional[str] = None
-) -> List[Dict[str, any]]:
+    api_key: Optional[str] = None,
+    with_arrays: bool = False
+):
     """
     End-to-end pipeline: Fetch CVEs from NVD and predict risk + anomaly.
     
@@ -275,26 +1282,130 @@ def process_new_cves(
         days_back (int): Number of days to look back
         max_results (int): Maximum CVEs to process
         api_key (str, optional): NVD API key
+        with_arrays (bool): Also return column arrays for vectorized
+            filtering (see results_to_arrays())
     
     Returns:
         list: [
             {
                 "cve_id": "CVE-XXXX-YYYY",
                 "risk": "HIGH" | "MEDIUM" | "LOW",
+                "risk_code": int (see RISK_CODES),
                 "confidence": float,
                 "anomalous": bool
             },
             ...
         ]
+        or, with with_arrays=True, (results, risk_codes, anomalous) as
+        returned by results_to_arrays()
     
     Raises:
         Exception: If fetching or prediction fails
     """
     logger.info("=== Starting CVE Real-time Processing ===")
     
-    # Step 1: Fetch CVEs from NVD
+    # Step 1: Fetch CVEs from NVD. A single page is streamed synchronously;
+    # larger requests fetch their startIndex pages concurrently (rate-limited)
+    try:
+        if max_results > NVD_MAX_PAGE_SIZE:
+            cves = fetch_cves_from_nvd_paginated(
+                days_back=days_back,
+                max_results=max_results,
+                api_key=api_key
+            )
+        else:
+            cves = fetch_cves_from_nvd(
+                days_back=days_back,
+                max_results=max_results,
+                api_key=api_key
+            )
+    except Exception as e:
+        logger.error(f"Failed to fetch CVEs: {e}")
+        raise
+    
+    # Step 2: Predict risk + anomaly for each CVE
+    results = _predict_cves(cves)
+    
+    if with_arrays:
+        return (results, *results_to_arrays(results))
+    return results
+
+
+def _risk_code(result: Dict[str, any]) -> int:
+    """RISK_CODES value of a result; rows built by callers may only carry the "risk" label."""
+    code = result.get("risk_code")
+    return RISK_CODES[result["risk"]] if code is None else code
+
+
+def results_to_arrays(results: List[Dict[str, any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column (struct-of-arrays) view of prediction results, so consumers can
+    filter with NumPy masks instead of per-dict Python comparisons.
+    
+    Args:
+        results (list): Prediction dicts as returned by process_new_cves()
+    
+    Returns:
+        tuple: (risk_codes, anomalous) - int8 array of RISK_CODES (0=LOW,
+        1=MEDIUM, 2=HIGH) and bool array of anomaly flags, both aligned
+        with results
+    """
+    risk_codes = np.fromiter((_risk_code(r) for r in results), dtype=np.int8, count=len(results))
+    anomalous = np.fromiter((r["anomalous"] for r in results), dtype=bool, count=len(results))
+    return risk_codes, anomalous
+
+
+def bucketize_results(
+    risk_codes: np.ndarray,
+    anomalous: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Row indices for the monitor's result buckets, computed with int8 /
+    bool mask operations over the column arrays.
+    
+    Args:
+        risk_codes (np.ndarray): int8 risk codes from results_to_arrays()
+        anomalous (np.ndarray): bool anomaly flags from results_to_arrays()
+    
+    Returns:
+        tuple: (high_idx, low_idx, anomalous_idx, critical_idx) where
+        critical = HIGH risk and anomalous
+    """
+    high_mask = risk_codes == RISK_CODE_HIGH
+    return (
+        np.flatnonzero(high_mask),
+        np.flatnonzero(risk_codes == RISK_CODE_LOW),
+        np.flatnonzero(anomalous),
+        np.flatnonzero(high_mask & anomalous)
+    )
+
+
+async def process_new_cves_async(
+    client: httpx.AsyncClient,
+    days_back: int = 7,
+    max_results: int = 20,
+    api_key: Optional[str] = None
+) -> List[Dict[str, any]]:
+    """
+    Async variant of process_new_cves() for use inside an event loop.
+    
+    NVD pages are fetched with the shared httpx client; the CPU-bound
+    prediction step runs in a worker thread.
+    
+    Args:
+        client (httpx.AsyncClient): Shared client (connection pooling)
+        days_back (int): Number of days to look back
+        max_results (int): Maximum CVEs to process
+        api_key (str, optional): NVD API key
+    
+    Returns:
+        list: Same structure as process_new_cves()
+    """
+    logger.info("=== Starting CVE Real-time Processing ===")
+    
     try:
-        cves = fetch_cves_from_nvd(
+        cves = await fetch_cves_from_nvd_async(
+            client,
             days_back=days_back,
             max_results=max_results,
             api_key=api_key
@@ -303,53 +1414,203 @@ def process_new_cves(
         logger.error(f"Failed to fetch CVEs: {e}")
         raise
     
+    return await asyncio.to_thread(_predict_cves, cves)
+
+
+def _predict_cves(cves: List[Dict[str, str]]) -> List[Dict[str, any]]:
+    """
+    Run risk prediction and anomaly detection for fetched CVEs.
+    
+    CVEs that fail to process are logged and skipped.
+    """
     if not cves:
         logger.warning("No CVEs fetched. Returning empty results.")
         return []
     
-    # Step 2: Process each CVE
+    batches = [
+        (cves[start:start + PREDICT_BATCH_SIZE], start)
+        for start in range(0, len(cves), PREDICT_BATCH_SIZE)
+    ]
+    
+    if len(batches) == 1:
+        results = predict_cve_batch(cves, offset=0, total=len(cves))
+    else:
+        # sklearn's tree/sparse kernels release the GIL, so batches scale
+        # across cores on threads; map() keeps results in input order
+        with ThreadPoolExecutor(max_workers=min(PREDICT_WORKERS, len(batches))) as executor:
+            results = [
+                result
+                for batch_results in executor.map(
+                    lambda args: predict_cve_batch(*args, total=len(cves)), batches
+                )
+                for result in batch_results
+            ]
+    
+    logger.info(f"=== Completed: {len(results)}/{len(cves)} CVEs processed ===")
+    return results
+
+
+def predict_cve_batch(
+    batch: List[Dict[str, str]],
+    offset: int,
+    total: int
+) -> List[Dict[str, any]]:
+    """
+    Score one batch of CVEs with a single TF-IDF transform and one call
+    per model, falling back to per-CVE processing if the batch fails.
+    
+    CVEs already in the disk cache at the same lastModified are returned
+    from the cache and not re-scored.
+    
+    Args:
+        batch (list): CVEs as returned by fetch_cves_from_nvd()
+        offset (int): Position of batch[0] in the full run (for progress logs)
+        total (int): Size of the full run (for progress logs)
+    
+    Returns:
+        list: Same structure as process_new_cves(); failed CVEs are skipped
+    """
+    cache_keys = [_prediction_cache_key(cve) for cve in batch]
+    cached = {
+        idx: _prediction_cache.get(key)
+        for idx, key in enumerate(cache_keys)
+        if key is not None
+    }
+    cached = {idx: result for idx, result in cached.items() if result is not None}
+    
+    # Cache misses keep their position in the full run for progress logs
+    misses = [(offset + idx, cve) for idx, cve in enumerate(batch) if idx not in cached]
+    scored = iter(_score_cve_batch(misses, total) if misses else [])
+    
+    results = []
+    for idx, (cve, key) in enumerate(zip(batch, cache_keys)):
+        if idx in cached:
+            logger.debug("[%d/%d] %s → unchanged, using cached prediction", offset + idx + 1, total, cve["cve_id"])
+            results.append(cached[idx])
+            continue
+        
+        result = next(scored)
+        if result is None:
+            continue
+        if key is not None:
+            _prediction_cache.set(key, result)
+        results.append(result)
+    
+    # One summary record per batch instead of one info line per CVE
+    if logger.isEnabledFor(logging.INFO):
+        risk_counts = Counter(_risk_code(result) for result in results)
+        logger.info(
+            "Processed CVEs %d-%d of %d: %d HIGH, %d MEDIUM, %d LOW, %d anomalous (%d cached, %d failed)",
+            offset + 1, offset + len(batch), total,
+            risk_counts[RISK_CODE_HIGH], risk_counts[RISK_CODE_MEDIUM], risk_counts[RISK_CODE_LOW],
+            sum(1 for result in results if result["anomalous"]),
+            len(cached), len(batch) - len(results)
+        )
+    
+    return results
+
+
+def _score_cve_batch(
+    misses: List[Tuple[int, Dict[str, str]]],
+    total: int
+) -> List[Optional[Dict[str, any]]]:
+    """
+    Run both models over (position in run, cve) pairs. Returns one entry
+    per CVE, None for CVEs that failed in the per-CVE fallback.
+    """
+    try:
+        # One TF-IDF transform + one call per model for the whole batch
+        risk_results, anomaly_results = analyze_descriptions(
+            [cve["description"] for _, cve in misses]
+        )
+    except Exception as e:
+        logger.error(f"  ✗ Batch prediction failed ({e}); retrying CVEs individually")
+        return [
+            next(_iter_predict_cves_individually([cve], offset=position, total=total), None)
+            for position, cve in misses
+        ]
+    
     results = []
-    for idx, cve in enumerate(cves, 1):
+    for (position, cve), risk_result, anomaly_result in zip(misses, risk_results, anomaly_results):
+        logger.debug(
+            "[%d/%d] %s → Risk: %s (confidence: %.2f%%), Anomalous: %s",
+            position + 1, total, cve["cve_id"], risk_result["risk"],
+            risk_result["confidence"] * 100, anomaly_result["anomalous"]
+        )
+        
+        # Batch helpers already return native Python types (JSON-safe)
+        results.append({
+            "cve_id": str(cve["cve_id"]),
+            "risk": risk_result["risk"],
+            "risk_code": risk_result["risk_code"],
+            "confidence": risk_result["confidence"],
+            "anomalous": anomaly_result["anomalous"]
+        })
+    
+    return results
+
+
+def _iter_predict_cves_individually(
+    cves: List[Dict[str, str]],
+    offset: int = 0,
+    total: Optional[int] = None
+) -> Iterator[Dict[str, any]]:
+    """
+    Per-CVE fallback for predict_cve_batch() so one bad description does
+    not drop the rest of its batch.
+    """
+    total = total or len(cves)
+    
+    for idx, cve in enumerate(cves, offset + 1):
         cve_id = cve["cve_id"]
-        description = cve["description"]
         
-        logger.info(f"[{idx}/{len(cves)}] Processing {cve_id}...")
+        logger.debug("[%d/%d] Processing %s...", idx, total, cve_id)
         
         try:
-            # Predict risk
-            risk_result = predict_risk(description)
-            
-            # Detect anomaly
-            anomaly_result = detect_anomaly(description)
+            # Predict risk + detect anomaly (one shared TF-IDF transform)
+            risk_result, anomaly_result = analyze_description(cve["description"])
             
             # Combine results with explicit type conversions for JSON safety
             # Ensures no NumPy types (np.bool_, np.float64, np.int64) leak through
-            output = {
+            yield {
                 "cve_id": str(cve_id),  # Ensure string (usually already is)
                 "risk": str(risk_result["risk"]),  # Ensure string
+                "risk_code": int(risk_result["risk_code"]),  # Integer code for filtering
                 "confidence": float(risk_result["confidence"]),  # Ensure native Python float
                 "anomalous": bool(anomaly_result["anomalous"])  # Ensure native Python bool
             }
-            
-            results.append(output)
-            
-            logger.info(
-                f"  → Risk: {risk_result['risk']} "
-                f"(confidence: {risk_result['confidence']:.2%}), "
-                f"Anomalous: {anomaly_result['anomalous']}"
-            )
         
         except Exception as e:
             logger.error(f"  ✗ Error processing {cve_id}: {e}")
             # Continue processing other CVEs
             continue
-    
-    logger.info(f"=== Completed: {len(results)}/{len(cves)} CVEs processed ===")
-    return results
 
 
 # --- Utility Functions ---
 
+def truncate_description(description: str, max_length: int = MAX_DESCRIPTION_LENGTH) -> str:
+    """
+    Cap a description at max_length characters, cutting at the last
+    whitespace before the limit so no token is split in half.
+    
+    Args:
+        description (str): Raw description text
+        max_length (int): Maximum number of characters to keep
+    
+    Returns:
+        str: The description unchanged if short enough, else truncated
+    """
+    if len(description) <= max_length:
+        return description
+    
+    head = description[:max_length]
+    if description[max_length].isspace():
+        return head.rstrip()  # Limit falls on a word boundary already
+    
+    parts = head.rsplit(None, 1)
+    return parts[0] if len(parts) == 2 else head
+
+
 def save_results_to_json(results: List[Dict], filename: str = "cve_predictions.json"):
     """
     Save prediction results to JSON file.
@@ -359,8 +1620,9 @@ def save_results_to_json(results: List[Dict], filename: str = "cve_predictions.j
         filename (str): Output filename
     """
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 bytes directly and also accepts stray NumPy scalars
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         logger.info(f"✓ Results saved to {filename}")
     except Exception as e:
         logger.error(f"✗ Error saving results: {e}")
@@ -381,15 +1643,17 @@ def print_results_summary(results: List[Dict]):
     print(f"CVE RISK PREDICTION SUMMARY ({len(results)} CVEs)")
     print("="*80)
     
-    high_risk_count = sum(1 for r in results if r["risk"] == "HIGH")
-    medium_risk_count = sum(1 for r in results if r["risk"] == "MEDIUM")
-    low_risk_count = sum(1 for r in results if r["risk"] == "LOW")
-    anomalous_count = sum(1 for r in results if r["anomalous"])
+    # Single pass over results for all four counts
+    risk_counts = Counter()
+    anomalous_count = 0
+    for r in results:
+        risk_counts[_risk_code(r)] += 1
+        anomalous_count += r["anomalous"]
     
     print(f"\n📊 Statistics:")
-    print(f"   HIGH Risk:    {high_risk_count}")
-    print(f"   MEDIUM Risk:  {medium_risk_count}")
-    print(f"   LOW Risk:     {low_risk_count}")
+    print(f"   HIGH Risk:    {risk_counts[RISK_CODE_HIGH]}")
+    print(f"   MEDIUM Risk:  {risk_counts[RISK_CODE_MEDIUM]}")
+    print(f"   LOW Risk:     {risk_counts[RISK_CODE_LOW]}")
     print(f"   Anomalous:    {anomalous_count}")
     
     print(f"\n📋 Detailed Results:")
@@ -397,9 +1661,10 @@ def print_results_summary(results: List[Dict]):
     
     for idx, result in enumerate(results, 1):
         # Risk level icons
-        if result["risk"] == "HIGH":
+        risk_code = _risk_code(result)
+        if risk_code == RISK_CODE_HIGH:
             risk_icon = "🚨"
-        elif result["risk"] == "MEDIUM":
+        elif risk_code == RISK_CODE_MEDIUM:
             risk_icon = "⚠️ "
         else:
             risk_icon = "✅"
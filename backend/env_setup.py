@@ -7,6 +7,18 @@ Loads environment variables from .env file for the CVE system.
 import os
 from pathlib import Path
 
+try:
+    from dotenv import dotenv_values
+except ImportError:
+    # python-dotenv is optional; fall back to the simple parser below
+    dotenv_values = None
+
+
+# Parsed .env contents keyed by (path, mtime_ns) so repeated loads in the
+# same process (module reloads, test runs) skip re-parsing an unchanged file.
+# Kept in memory only: the file holds secrets, so nothing is cached to disk.
+_env_cache = {}
+
 
 def load_env_file(env_path=None):
     """
@@ -32,43 +44,70 @@ def load_env_file(env_path=None):
         # Silently continue without .env - this is not an error
         return {}
     
-    loaded_vars = {}
-    
     try:
-        with open(env_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                # Skip comments and empty lines
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Parse KEY=VALUE
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Remove quotes if present
-                    if value.startswith('"') and value.endswith('"'):
-                        value = value[1:-1]
-                    elif value.startswith("'") and value.endswith("'"):
-                        value = value[1:-1]
-                    
-                    # Set environment variable
-                    os.environ[key] = value
-                    loaded_vars[key] = value
+        cache_key = (str(env_path.resolve()), env_path.stat().st_mtime_ns)
+        loaded_vars = _env_cache.get(cache_key)
+        
+        if loaded_vars is None:
+            loaded_vars = _parse_env_file(env_path)
+            _env_cache[cache_key] = loaded_vars
+        
+        # Set environment variables
+        os.environ.update(loaded_vars)
         
         print(f"✅ Loaded {len(loaded_vars)} environment variable(s) from {env_path.name}")
         for key in loaded_vars:
             print(f"   - {key}")
         
-        return loaded_vars
+        return dict(loaded_vars)
     
     except Exception as e:
         print(f"❌ Error loading .env file: {e}")
         return {}
 
 
+def _parse_env_file(env_path):
+    """
+    Parse KEY=VALUE pairs from a .env file.
+    
+    Uses python-dotenv when installed (handles escapes, multiline values
+    and ${VAR} expansion); otherwise a minimal line-based parser.
+    
+    Args:
+        env_path (Path): Path to .env file
+    
+    Returns:
+        dict: Parsed variables (keys without a value are skipped)
+    """
+    if dotenv_values is not None:
+        return {key: value for key, value in dotenv_values(env_path).items() if value is not None}
+    
+    parsed_vars = {}
+    
+    with open(env_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            # Skip comments and empty lines
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            # Parse KEY=VALUE
+            if '=' in line:
+                key, value = line.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                
+                # Remove quotes if present
+                if value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1]
+                elif value.startswith("'") and value.endswith("'"):
+                    value = value[1:-1]
+                
+                parsed_vars[key] = value
+    
+    return parsed_vars
+
+
 def get_nvd_api_key():
     """
     Get NVD API key from environment.
@@ -0,0 +1,69 @@
+"""
+ONNX Export
+===========
+Converts the trained classifier (rf_model.pkl) to rf_model.onnx so
+cve_realtime_processor can score with ONNX Runtime instead of sklearn.
+
+The TF-IDF vectorizer stays in sklearn; the ONNX graph takes its output
+as a dense float32 matrix. train_model.py calls export_classifier() after
+training when skl2onnx is installed; to export an existing model manually:
+
+    pip install skl2onnx onnxruntime
+    python export_onnx.py
+"""
+
+import joblib
+import numpy as np
+import onnxruntime
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+MODEL_PATH = "rf_model.pkl"
+ONNX_PATH = "rf_model.onnx"
+
+
+def export_classifier(clf, onnx_path: str = ONNX_PATH) -> float:
+    """
+    Convert a fitted classifier to ONNX and check it against sklearn.
+    
+    Args:
+        clf: Fitted sklearn classifier (predict_proba over TF-IDF features)
+        onnx_path (str): Output path for the ONNX model
+    
+    Returns:
+        float: Max absolute probability difference vs. sklearn on random inputs
+    """
+    n_features = clf.n_features_in_
+    
+    # zipmap disabled so probabilities come back as a plain array
+    onnx_model = convert_sklearn(
+        clf,
+        initial_types=[("input", FloatTensorType([None, n_features]))],
+        options={id(clf): {"zipmap": False}}
+    )
+    
+    with open(onnx_path, "wb") as f:
+        f.write(onnx_model.SerializeToString())
+    
+    # Sanity check against sklearn on random inputs
+    sess = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+    X_check = np.random.default_rng(42).random((32, n_features), dtype=np.float32)
+    onnx_probs = sess.run(None, {"input": X_check})[1]
+    return float(np.abs(onnx_probs - clf.predict_proba(X_check)).max())
+
+
+if __name__ == "__main__":
+    # 1. Load trained classifier
+    print("Loading model...")
+    try:
+        clf = joblib.load(MODEL_PATH)
+    except FileNotFoundError:
+        print(f"Error: {MODEL_PATH} not found. Run train_model.py first.")
+        exit(1)
+    
+    # 2. Convert and verify
+    print(f"Converting {type(clf).__name__} ({clf.n_features_in_} features)...")
+    max_diff = export_classifier(clf)
+    print(f"Max probability difference: {max_diff:.2e}")
+    
+    print(f"Done. Model saved as {ONNX_PATH}")
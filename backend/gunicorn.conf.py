@@ -0,0 +1,38 @@
+"""
+Gunicorn Configuration for the CVE Risk Prediction API
+======================================================
+Multi-process production deployment using uvicorn workers.
+
+Run with: gunicorn app:app -c gunicorn.conf.py
+
+Design Principles:
+- preload_app imports app (and so loads the ML models in
+  cve_realtime_processor) once in the master before forking; workers share
+  the loaded model pages copy-on-write instead of each holding a copy
+- One worker per CPU core so CPU-bound inference uses every core
+- Workers are recycled periodically to bound memory fragmentation
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Load models once in the master, then fork
+preload_app = True
+
+# Recycle workers (with jitter so they don't all restart together)
+max_requests = 10000
+max_requests_jitter = 1000
+
+
+def pre_fork(server, worker):
+    """
+    Move objects created during preload (models included) out of the
+    garbage collector's tracked generations, so collections in workers
+    don't write to those pages and break copy-on-write sharing.
+    """
+    gc.freeze()
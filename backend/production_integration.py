@@ -4,14 +4,22 @@ Production Integration Example
 Shows how to integrate CVE real-time processing into production systems.
 """
 
+import io
 import logging
-import json
+import textwrap
+import orjson
+import requests
 from datetime import datetime
 from typing import List, Dict
+import numpy as np
 from cve_realtime_processor import (
+    MAX_DESCRIPTION_LENGTH,
+    bucketize_results,
     process_new_cves,
+    results_to_arrays,
     predict_risk,
-    detect_anomaly
+    detect_anomaly,
+    truncate_description
 )
 
 # Configure production logging
@@ -25,12 +33,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated webhook posts reuse a keep-alive connection
+WEBHOOK_SESSION = requests.Session()
+WEBHOOK_HEADERS = {"Content-Type": "application/json"}
+
 
 class CVEMonitor:
     """
     Production-ready CVE monitoring system.
     """
     
+    # Entries listed per report section before "... and N more"
+    REPORT_TOP_N = 10
+    
     def __init__(self, api_key: str = None):
         """
         Initialize CVE monitor.
@@ -41,74 +56,110 @@ class CVEMonitor:
         self.api_key = api_key
         logger.info("CVE Monitor initialized")
     
-    def fetch_and_analyze(self, days_back: int = 1, max_results: int = 100) -> Dict:
+    def fetch_and_analyze(
+        self,
+        days_back: int = 1,
+        max_results: int = 100,
+        include_all: bool = False
+    ) -> Dict:
         """
         Fetch and analyze recent CVEs.
         
         Args:
             days_back (int): Days to look back
             max_results (int): Maximum CVEs to process
+            include_all (bool): Also keep the full result list in the
+                summary (see _categorize_results())
         
         Returns:
             dict: Analysis summary with categorized results
         """
-        logger.info(f"Starting CVE analysis (days_back={days_back}, max={max_results})")
+        logger.info("Starting CVE analysis (days_back=%s, max=%s)", days_back, max_results)
+        
+        # One timestamp for the whole run, taken when the analysis starts
+        timestamp = datetime.utcnow().isoformat()
         
         try:
             # Fetch and process CVEs
-            results = process_new_cves(
+            results, risk_codes, anomalous = process_new_cves(
                 days_back=days_back,
                 max_results=max_results,
-                api_key=self.api_key
+                api_key=self.api_key,
+                with_arrays=True
             )
             
             # Categorize results
-            summary = self._categorize_results(results)
+            summary = self._categorize_results(
+                results, risk_codes, anomalous, timestamp, include_all=include_all
+            )
             
             # Log summary
             logger.info(
-                f"Analysis complete: {summary['total']} CVEs - "
-                f"High Risk: {summary['high_risk_count']}, "
-                f"Anomalous: {summary['anomalous_count']}"
+                "Analysis complete: %d CVEs - High Risk: %d, Anomalous: %d",
+                summary['total'], summary['high_risk_count'], summary['anomalous_count']
             )
             
             return summary
         
         except Exception as e:
-            logger.error(f"Analysis failed: {e}")
+            logger.error("Analysis failed: %s", e)
             raise
     
-    def _categorize_results(self, results: List[Dict]) -> Dict:
+    def _categorize_results(
+        self,
+        results: List[Dict],
+        risk_codes: np.ndarray = None,
+        anomalous: np.ndarray = None,
+        timestamp: str = None,
+        include_all: bool = False
+    ) -> Dict:
         """
         Categorize analysis results.
         
         Args:
             results (list): Raw analysis results
+            risk_codes (np.ndarray, optional): int8 risk code per result
+            anomalous (np.ndarray, optional): Anomaly flag per result
+                (both derived from results if not given)
+            timestamp (str, optional): ISO timestamp of the analysis run
+                (current UTC time if not given)
+            include_all (bool): Add 'all_results' with every result. Off by
+                default since the buckets already hold the HIGH, LOW and
+                anomalous rows and the copy doubles saved/sent JSON
         
         Returns:
             dict: Categorized summary
         """
-        high_risk = [r for r in results if r['risk'] == 'HIGH']
-        low_risk = [r for r in results if r['risk'] == 'LOW']
-        anomalous = [r for r in results if r['anomalous']]
-        critical_anomalies = [
-            r for r in results 
-            if r['risk'] == 'HIGH' and r['anomalous']
-        ]
+        if risk_codes is None or anomalous is None:
+            risk_codes, anomalous = results_to_arrays(results)
+        if timestamp is None:
+            timestamp = datetime.utcnow().isoformat()
         
-        return {
-            'timestamp': datetime.utcnow().isoformat(),
+        # Bucket indices computed over int8/bool columns; Python only
+        # touches the selected rows
+        high_idx, low_idx, anomalous_idx, critical_idx = bucketize_results(risk_codes, anomalous)
+        
+        high_risk = [results[i] for i in high_idx]
+        low_risk = [results[i] for i in low_idx]
+        anomalous_cves = [results[i] for i in anomalous_idx]
+        critical_anomalies = [results[i] for i in critical_idx]
+        
+        summary = {
+            'timestamp': timestamp,
             'total': len(results),
             'high_risk_count': len(high_risk),
             'low_risk_count': len(low_risk),
-            'anomalous_count': len(anomalous),
+            'anomalous_count': len(anomalous_cves),
             'critical_anomalies_count': len(critical_anomalies),
             'high_risk_cves': high_risk,
             'low_risk_cves': low_risk,
-            'anomalous_cves': anomalous,
-            'critical_anomalies': critical_anomalies,
-            'all_results': results
+            'anomalous_cves': anomalous_cves,
+            'critical_anomalies': critical_anomalies
         }
+        if include_all:
+            summary['all_results'] = results
+        
+        return summary
     
     def generate_report(self, summary: Dict, output_file: str = None) -> str:
         """
@@ -121,61 +172,59 @@ class CVEMonitor:
         Returns:
             str: Report text
         """
-        report_lines = [
-            "="*80,
-            "CVE RISK ANALYSIS REPORT",
-            "="*80,
-            f"Generated: {summary['timestamp']}",
-            f"Analysis Period: Last {summary.get('days_analyzed', 'N/A')} days",
-            "",
-            "SUMMARY",
-            "-"*80,
-            f"Total CVEs Analyzed:      {summary['total']}",
-            f"High Risk CVEs:           {summary['high_risk_count']}",
-            f"Low Risk CVEs:            {summary['low_risk_count']}",
-            f"Anomalous Patterns:       {summary['anomalous_count']}",
-            f"Critical Anomalies:       {summary['critical_anomalies_count']}",
-            ""
-        ]
+        buf = io.StringIO()
+        w = buf.write
         
-        # Critical anomalies section
-        if summary['critical_anomalies']:
-            report_lines.extend([
-                "⚠️  CRITICAL ANOMALIES (High Risk + Anomalous)",
-                "-"*80
-            ])
-            for cve in summary['critical_anomalies']:
-                report_lines.append(
-                    f"  • {cve['cve_id']}: Risk={cve['risk']}, "
-                    f"Confidence={cve['confidence']:.1%}"
-                )
-            report_lines.append("")
+        w("="*80 + "\n")
+        w("CVE RISK ANALYSIS REPORT\n")
+        w("="*80 + "\n")
+        w(f"Generated: {summary['timestamp']}\n")
+        w(f"Analysis Period: Last {summary.get('days_analyzed', 'N/A')} days\n")
+        w("\n")
+        w("SUMMARY\n")
+        w("-"*80 + "\n")
+        w(f"Total CVEs Analyzed:      {summary['total']}\n")
+        w(f"High Risk CVEs:           {summary['high_risk_count']}\n")
+        w(f"Low Risk CVEs:            {summary['low_risk_count']}\n")
+        w(f"Anomalous Patterns:       {summary['anomalous_count']}\n")
+        w(f"Critical Anomalies:       {summary['critical_anomalies_count']}\n")
+        w("\n")
+        
+        # Critical anomalies section (only the listed entries get formatted)
+        critical = summary['critical_anomalies']
+        if critical:
+            w("⚠️  CRITICAL ANOMALIES (High Risk + Anomalous)\n")
+            w("-"*80 + "\n")
+            for cve in critical[:self.REPORT_TOP_N]:
+                w(f"  • {cve['cve_id']}: Risk={cve['risk']}, "
+                  f"Confidence={cve['confidence']:.1%}\n")
+            if len(critical) > self.REPORT_TOP_N:
+                w(f"  ... and {len(critical) - self.REPORT_TOP_N} more\n")
+            w("\n")
         
         # High risk CVEs
-        if summary['high_risk_cves']:
-            report_lines.extend([
-                "🚨 HIGH RISK CVEs",
-                "-"*80
-            ])
-            for cve in summary['high_risk_cves'][:10]:  # Top 10
+        high_risk = summary['high_risk_cves']
+        if high_risk:
+            w("🚨 HIGH RISK CVEs\n")
+            w("-"*80 + "\n")
+            for cve in high_risk[:self.REPORT_TOP_N]:
                 anomaly_flag = "⚠️" if cve['anomalous'] else "  "
-                report_lines.append(
-                    f"  {anomaly_flag} {cve['cve_id']}: "
-                    f"Confidence={cve['confidence']:.1%}"
-                )
-            if len(summary['high_risk_cves']) > 10:
-                report_lines.append(f"  ... and {len(summary['high_risk_cves']) - 10} more")
-            report_lines.append("")
+                w(f"  {anomaly_flag} {cve['cve_id']}: "
+                  f"Confidence={cve['confidence']:.1%}\n")
+            if len(high_risk) > self.REPORT_TOP_N:
+                w(f"  ... and {len(high_risk) - self.REPORT_TOP_N} more\n")
+            w("\n")
         
-        report_lines.append("="*80)
+        w("="*80)
         
-        report_text = "\n".join(report_lines)
+        report_text = buf.getvalue()
         
         # Save to file if specified
         if output_file:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(report_text)
-            logger.info(f"Report saved to {output_file}")
+            # Binary write: no newline translation pass, same bytes on every OS
+            with open(output_file, 'wb') as f:
+                f.write(report_text.encode('utf-8'))
+            logger.info("Report saved to %s", output_file)
         
         return report_text
     
@@ -187,9 +236,11 @@ class CVEMonitor:
             summary (dict): Analysis summary
             output_file (str): Output file path
         """
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2)
-        logger.info(f"Results saved to {output_file}")
+        # orjson serializes straight to UTF-8 bytes in C (no pure-Python
+        # indent=2 encoder path, no intermediate str)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        logger.info("Results saved to %s", output_file)
 
 
 def scheduled_monitoring():
@@ -218,8 +269,8 @@ def scheduled_monitoring():
         # Send alerts if critical anomalies found
         if summary['critical_anomalies_count'] > 0:
             logger.warning(
-                f"⚠️  ALERT: {summary['critical_anomalies_count']} "
-                f"critical anomalies detected!"
+                "⚠️  ALERT: %d critical anomalies detected!",
+                summary['critical_anomalies_count']
             )
             # TODO: Send email/webhook notification
         
@@ -227,10 +278,25 @@ def scheduled_monitoring():
         return summary
     
     except Exception as e:
-        logger.error(f"Scheduled monitoring failed: {e}")
+        logger.error("Scheduled monitoring failed: %s", e)
         raise
 
 
+def _description_preview(description: str, width: int = 100) -> str:
+    """
+    Word-boundary preview of a description for logs and webhook bodies.
+    
+    Only a small head slice is handed to textwrap.shorten(), so long
+    descriptions are never split into words in full. When the first word
+    alone exceeds width (e.g. a long URL), shorten() collapses to the bare
+    placeholder, so the head is hard-sliced instead.
+    """
+    preview = textwrap.shorten(description[:width * 2], width=width, placeholder="...")
+    if preview == "..." and len(description.strip()) > width:
+        return description.strip()[:width - 3] + "..."
+    return preview
+
+
 def on_demand_analysis(cve_description: str) -> Dict:
     """
     Example: On-demand analysis of a single CVE description.
@@ -243,6 +309,14 @@ def on_demand_analysis(cve_description: str) -> Dict:
     """
     logger.info("Starting on-demand CVE analysis")
     
+    # Webhook bodies can be arbitrarily large; never tokenize multi-MB text
+    if len(cve_description) > MAX_DESCRIPTION_LENGTH:
+        logger.warning(
+            "Description truncated from %d to %d characters",
+            len(cve_description), MAX_DESCRIPTION_LENGTH
+        )
+        cve_description = truncate_description(cve_description)
+    
     try:
         # Predict risk
         risk_result = predict_risk(cve_description)
@@ -252,7 +326,7 @@ def on_demand_analysis(cve_description: str) -> Dict:
         
         # Combine results
         result = {
-            'description_preview': cve_description[:100] + "...",
+            'description_preview': _description_preview(cve_description),
             'risk': risk_result['risk'],
             'confidence': risk_result['confidence'],
             'anomalous': anomaly_result['anomalous'],
@@ -261,26 +335,28 @@ def on_demand_analysis(cve_description: str) -> Dict:
         }
         
         logger.info(
-            f"Analysis complete: Risk={result['risk']}, "
-            f"Anomalous={result['anomalous']}"
+            "Analysis complete: Risk=%s, Anomalous=%s",
+            result['risk'], result['anomalous']
         )
         
         return result
     
     except Exception as e:
-        logger.error(f"On-demand analysis failed: {e}")
+        logger.error("On-demand analysis failed: %s", e)
         raise
 
 
-def webhook_integration(webhook_url: str, summary: Dict):
+def webhook_integration(webhook_url: str, summary: Dict, session: requests.Session = None):
     """
     Example: Send results to webhook (Slack, Teams, etc.)
     
     Args:
         webhook_url (str): Webhook URL
         summary (dict): Analysis summary
+        session (requests.Session, optional): Session to send with
+            (defaults to the module-level keep-alive session)
     """
-    import requests
+    session = session or WEBHOOK_SESSION
     
     message = {
         "text": f"CVE Analysis Alert: {summary['critical_anomalies_count']} critical anomalies detected",
@@ -299,11 +375,17 @@ def webhook_integration(webhook_url: str, summary: Dict):
     }
     
     try:
-        response = requests.post(webhook_url, json=message, timeout=10)
+        # Serialize once with orjson and send the bytes as-is
+        response = session.post(
+            webhook_url,
+            data=orjson.dumps(message),
+            headers=WEBHOOK_HEADERS,
+            timeout=10
+        )
         response.raise_for_status()
         logger.info("Webhook notification sent successfully")
     except Exception as e:
-        logger.error(f"Failed to send webhook notification: {e}")
+        logger.error("Failed to send webhook notification: %s", e)
 
 
 # ===========================
@@ -5,7 +5,6 @@ Simple script to test the CVE real-time processing system.
 """
 
 import sys
-import os
 
 # Ensure environment is set up
 try:
@@ -18,6 +17,9 @@ except Exception as e:
 
 # Import main processor
 from cve_realtime_processor import (
+    MAX_DESCRIPTION_LENGTH,
+    load_models,
+    missing_model_files,
     predict_risk,
     detect_anomaly,
     process_new_cves,
@@ -26,6 +28,28 @@ from cve_realtime_processor import (
 )
 
 
+def _read_until_blank_lines() -> str:
+    """
+    Read pasted lines from an interactive terminal until two consecutive
+    blank lines (or EOF). Blank lines inside the text are dropped.
+    """
+    lines = []
+    previous_blank = False
+    
+    for line in iter(sys.stdin.readline, ""):
+        line = line.rstrip("\n")
+        if not line.strip():
+            # Two consecutive empty lines = end of input
+            if previous_blank:
+                break
+            previous_blank = True
+            continue
+        previous_blank = False
+        lines.append(line)
+    
+    return "\n".join(lines).strip()
+
+
 def manual_description_mode():
     """
     Manual vulnerability description input mode
@@ -35,32 +59,18 @@ def manual_description_mode():
     print("MANUAL VULNERABILITY ANALYSIS")
     print("="*80 + "\n")
     
-    print("Enter or paste a vulnerability description below.")
-    print("Press Enter twice (blank line) when finished:\n")
-    print("-" * 80)
-    
-    # Collect multi-line input
-    lines = []
-    empty_line_count = 0
-    
-    while True:
-        try:
-            line = input()
-            if line.strip() == "":
-                empty_line_count += 1
-                # Two consecutive empty lines = end of input
-                if empty_line_count >= 2:
-                    break
-            else:
-                empty_line_count = 0
-                lines.append(line)
-        except EOFError:
-            break
-    
-    description = "\n".join(lines).strip()
+    if not sys.stdin.isatty():
+        # Piped/redirected input: take everything in one read
+        description = sys.stdin.read().strip()
+    else:
+        print("Enter or paste a vulnerability description below.")
+        print("Press Enter twice (blank line) when finished:\n")
+        print("-" * 80)
+        description = _read_until_blank_lines()
     
     # Validate input
     MIN_LENGTH = 20  # Minimum character count for meaningful analysis
+    MAX_LENGTH = MAX_DESCRIPTION_LENGTH  # Reject pathological pastes before TF-IDF
     
     if not description:
         print("\n❌ Error: No input provided.\n")
@@ -70,6 +80,10 @@ def manual_description_mode():
         print(f"\n❌ Error: Description too short (minimum {MIN_LENGTH} characters).\n")
         return False
     
+    if len(description) > MAX_LENGTH:
+        print(f"\n❌ Error: Description too long (maximum {MAX_LENGTH:,} characters).\n")
+        return False
+    
     print("-" * 80)
     print(f"\n📊 Analyzing description ({len(description)} characters)...\n")
     
@@ -184,13 +198,7 @@ def main():
     print("🔥"*40 + "\n")
     
     # Check if models exist
-    required_files = [
-        "rf_model.pkl",
-        "tfidf_vectorizer.pkl",
-        "anomaly_model.pkl"
-    ]
-    
-    missing_files = [f for f in required_files if not os.path.exists(f)]
+    missing_files = missing_model_files()
     
     if missing_files:
         print("❌ ERROR: Required model files not found:")
@@ -202,6 +210,10 @@ def main():
     else:
         print("✅ All required model files found\n")
     
+    # Deserialize models once up front so no menu action pays the cold
+    # unpickling cost; every mode below reuses the same loaded instances
+    load_models()
+    
     # Display menu
     print("=" * 80)
     print("SELECT ANALYSIS MODE")
@@ -1,32 +1,41 @@
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
 import time
 
 BASE_URL = "http://127.0.0.1:5000"
 
+# Shared keep-alive session: every probe reuses one pooled connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def _pretty(data) -> str:
+    """Indented JSON text for printing (orjson encodes in C)."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
 def test_predict():
     print("\n--- Testing /predict ---")
     payload = {
         "description": "An attacker could execute arbitrary code remotely by sending a specially crafted packet."
     }
     try:
-        res = requests.post(f"{BASE_URL}/predict", json=payload)
+        res = SESSION.post(f"{BASE_URL}/predict", json=payload)
         print(f"Status: {res.status_code}")
-        print(json.dumps(res.json(), indent=2))
+        print(_pretty(orjson.loads(res.content)))
     except Exception as e:
         print(f"Error: {e}")
 
 def test_latest_cves():
     print("\n--- Testing /predict/latest-cves (This might take a moment) ---")
     try:
-        res = requests.get(f"{BASE_URL}/predict/latest-cves")
+        res = SESSION.get(f"{BASE_URL}/predict/latest-cves")
         print(f"Status: {res.status_code}")
-        data = res.json()
+        data = orjson.loads(res.content)
         if "predictions" in data:
             print(f"Fetched {data.get('count', 0)} CVEs")
             if data["predictions"]:
                 print("First prediction sample:")
-                print(json.dumps(data["predictions"][0], indent=2))
+                print(_pretty(data["predictions"][0]))
         else:
             print("Response:", data)
     except Exception as e:
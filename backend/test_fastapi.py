@@ -11,10 +11,19 @@ Usage:
 """
 
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Shared keep-alive session: every test reuses one pooled connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+def _pretty(data) -> str:
+    """Indented JSON text for printing (orjson encodes in C)."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
 def test_health_check():
     """Test the health endpoint"""
     print("\n" + "="*80)
@@ -22,9 +31,9 @@ def test_health_check():
     print("="*80)
     
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {_pretty(orjson.loads(response.content))}")
         return response.status_code == 200
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -42,12 +51,12 @@ def test_predict_endpoint():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/predict",
             json=test_payload
         )
         print(f"Status Code: {response.status_code}")
-        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        print(f"Response: {_pretty(orjson.loads(response.content))}")
         return response.status_code == 200
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -62,7 +71,7 @@ def test_latest_cves_endpoint():
     print("⚠️  Note: This requires internet connection and may take a few seconds...")
     
     try:
-        response = requests.get(
+        response = SESSION.get(
             f"{BASE_URL}/predict/latest-cves",
             params={
                 "days_back": 3,
@@ -70,15 +79,15 @@ def test_latest_cves_endpoint():
             }
         )
         print(f"Status Code: {response.status_code}")
-        result = response.json()
+        result = orjson.loads(response.content)
         
         if isinstance(result, list):
             print(f"Number of CVEs fetched: {len(result)}")
             if result:
                 print(f"\nFirst CVE result:")
-                print(json.dumps(result[0], indent=2))
+                print(_pretty(result[0]))
         else:
-            print(f"Response: {json.dumps(result, indent=2)}")
+            print(f"Response: {_pretty(result)}")
         
         return response.status_code == 200
     except Exception as e:
@@ -5,7 +5,7 @@ Tests that the JSON serialization fix works correctly.
 """
 
 import json
-from cve_realtime_processor import predict_risk, detect_anomaly
+from cve_realtime_processor import predict_risk, detect_anomaly, analyze_descriptions
 
 print("="*80)
 print("JSON SERIALIZATION FIX - VERIFICATION TEST")
@@ -68,10 +68,11 @@ test_descriptions = [
     "Authentication bypass vulnerability"
 ]
 
+# One TF-IDF transform and one call per model for the whole list
+risk_results, anomaly_results = analyze_descriptions(test_descriptions)
+
 batch_results = []
-for i, desc in enumerate(test_descriptions, 1):
-    r = predict_risk(desc)
-    a = detect_anomaly(desc)
+for i, (r, a) in enumerate(zip(risk_results, anomaly_results), 1):
     batch_results.append({
         "cve_id": f"CVE-TEST-00{i}",
         "risk": r["risk"],
@@ -79,6 +80,10 @@ for i, desc in enumerate(test_descriptions, 1):
         "anomalous": a["anomalous"]
     })
 
+# Batch path must also yield native Python types
+assert all(isinstance(r["confidence"], float) and not isinstance(r["confidence"], np.float64) for r in batch_results)
+assert all(type(r["anomalous"]) is bool for r in batch_results)
+
 try:
     json_str = json.dumps(batch_results, indent=2)
     print(f"✅ SUCCESS - Batch of {len(batch_results)} CVEs serialized")
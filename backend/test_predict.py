@@ -4,11 +4,17 @@ Quick Prediction Test
 Tests the /predict endpoint with a sample CVE description
 """
 
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Keep-alive session: repeated calls (e.g. from other scripts importing
+# test_prediction) reuse one pooled connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 # Sample CVE description for testing
 test_description = """
 A remote code execution vulnerability exists in the web application framework
@@ -31,16 +37,16 @@ def test_prediction():
     print(f"📝 Description length: {len(payload['description'])} characters\n")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/predict",
-            json=payload,
-            headers={"Content-Type": "application/json"}
+            json=payload
         )
         
         print(f"📊 Status Code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            # The API responds via ORJSONResponse; decode with orjson too
+            result = orjson.loads(response.content)
             print(f"\n✅ SUCCESS - Prediction Result:")
             print("=" * 80)
             print(f"Risk Level:      {result['risk']}")
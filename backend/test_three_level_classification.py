@@ -2,10 +2,18 @@
 Test Script for Three-Level Risk Classification
 ================================================
 Demonstrates the upgraded HIGH/MEDIUM/LOW risk classification system.
+
+Runs the models in-process by default; pass --api to score the same test
+cases through a running API server (POST /predict/batch) instead. Either
+way all test cases are scored in one batched call.
 """
 
 import sys
-from cve_realtime_processor import predict_risk, detect_anomaly
+import httpx
+import orjson
+from cve_realtime_processor import analyze_descriptions
+
+BASE_URL = "http://127.0.0.1:8000"
 
 # Test descriptions with varying risk profiles
 test_cases = [
@@ -31,7 +39,41 @@ test_cases = [
     }
 ]
 
+def score_test_cases(use_api: bool):
+    """
+    Score every test case with one batched call: a single /predict/batch
+    request (one round trip, one vectorizer + model pass on the server)
+    or one in-process analyze_descriptions() call.
+    
+    Returns:
+        list: (risk_result, anomaly_result) per test case, in order
+    """
+    descriptions = [t["description"] for t in test_cases]
+    
+    if use_api:
+        response = httpx.post(
+            f"{BASE_URL}/predict/batch",
+            json={"descriptions": descriptions},
+            timeout=30
+        )
+        response.raise_for_status()
+        # Each batch item carries both risk and anomaly fields
+        predictions = orjson.loads(response.content)
+        return [(p, p) for p in predictions]
+    
+    risk_results, anomaly_results = analyze_descriptions(descriptions)
+    return list(zip(risk_results, anomaly_results))
+
+
 def main():
+    use_api = "--api" in sys.argv[1:]
+    
+    try:
+        scored = score_test_cases(use_api)
+    except Exception as e:
+        print("ERROR: Scoring failed: {}".format(e))
+        sys.exit(1)
+    
     print("\n" + "="*80)
     print("THREE-LEVEL RISK CLASSIFICATION TEST")
     print("="*80 + "\n")
@@ -47,9 +89,8 @@ def main():
         print("Description: {}...".format(test['description'][:80]))
         
         try:
-            # Predict risk with new three-level system
-            risk_result = predict_risk(test['description'])
-            anomaly_result = detect_anomaly(test['description'])
+            # Three-level risk + anomaly results from the batched call
+            risk_result, anomaly_result = scored[idx - 1]
             
             # Determine risk indicator
             if risk_result['risk'] == 'HIGH':
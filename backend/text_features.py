@@ -0,0 +1,83 @@
+"""
+Text Feature Extraction
+=======================
+Shared text feature definitions for training and inference:
+
+- The stateless hashing front-end used when the TF-IDF stage is persisted
+  as a bare TfidfTransformer (IDF vector only) instead of a fitted
+  TfidfVectorizer. Training and inference must build the HashingVectorizer
+  with exactly the same parameters, so both import it from here.
+- CachedTfidfVectorizer, a training-time TfidfVectorizer that memoizes
+  per-document analysis for corpora with many repeated descriptions.
+"""
+
+from functools import lru_cache
+
+import joblib
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline, make_pipeline
+
+
+# Hashed feature space; collisions are negligible at this size for CVE text
+HASHING_N_FEATURES = 2 ** 20
+
+# Distinct documents whose token lists are memoized by CachedTfidfVectorizer
+ANALYZER_CACHE_SIZE = 200_000
+
+
+class CachedTfidfVectorizer(TfidfVectorizer):
+    """
+    TfidfVectorizer whose analyzer (preprocess + tokenize + stop words +
+    n-grams) is memoized per raw document string. CVE dumps repeat vendor
+    boilerplate heavily, so repeated descriptions cost one dict lookup.
+    
+    The cache lives only on the analyzer built for each fit/transform call,
+    so it always matches the constructor parameters. Pickles as a plain
+    TfidfVectorizer: saved artifacts do not depend on this class and load
+    into the inference fast path unchanged.
+    """
+    
+    def build_analyzer(self):
+        return lru_cache(maxsize=ANALYZER_CACHE_SIZE)(super().build_analyzer())
+    
+    def __reduce__(self):
+        state = self.__getstate__()
+        # BaseEstimator only records the version for classes defined in
+        # sklearn itself; without it every load warns "pre-0.18" and real
+        # version skew goes undetected
+        state["_sklearn_version"] = sklearn.__version__
+        return (TfidfVectorizer, (), state)
+
+
+def make_hashing_vectorizer() -> HashingVectorizer:
+    """
+    Build the stateless token-hashing stage.
+    
+    Raw term counts (norm=None, non-negative) so a TfidfTransformer fitted
+    on top reproduces TfidfVectorizer weighting without a vocabulary dict.
+    
+    Returns:
+        HashingVectorizer: Unfitted, stateless vectorizer (needs no pickling)
+    """
+    return HashingVectorizer(
+        n_features=HASHING_N_FEATURES,
+        alternate_sign=False,
+        norm=None,
+        stop_words="english"
+    )
+
+
+def load_hashing_vectorizer(transformer_path: str) -> Pipeline:
+    """
+    Rebuild the inference vectorizer from a pickled TfidfTransformer.
+    
+    Args:
+        transformer_path (str): Path to the fitted TfidfTransformer pickle
+    
+    Returns:
+        Pipeline: HashingVectorizer -> TfidfTransformer, exposing the same
+        transform() interface as a fitted TfidfVectorizer
+    """
+    # mmap the IDF vector so forked workers share it via the page cache
+    return make_pipeline(make_hashing_vectorizer(), joblib.load(transformer_path, mmap_mode="r"))
@@ -1,34 +1,101 @@
+import os
 import pandas as pd
 import joblib
+import scipy.sparse
 from sklearn.ensemble import IsolationForest
-
-# 1. Load data
-print("Loading data...")
-try:
-    df = pd.read_csv("cve_data.csv", engine="python", on_bad_lines="skip")
-except FileNotFoundError:
-    print("Error: cve_data.csv not found.")
-    exit(1)
+from text_features import load_hashing_vectorizer
 
 TEXT_COL = "Description"
-df = df[df[TEXT_COL].notnull()]
+CHUNK_SIZE = 50_000  # CSV rows parsed and vectorized at a time
+DATA_PATH = "cve_data.csv"
+TRAIN_CACHE_DIR = ".train_cache"  # Vectorized corpus reused across re-runs
+
+memory = joblib.Memory(TRAIN_CACHE_DIR, verbose=0)
+
+
+def vectorizer_path() -> str:
+    """
+    Vectorizer artifact to use, with the same preference as inference:
+    hashing TfidfTransformer if train_model.py saved one, else TfidfVectorizer.
+    """
+    if os.path.exists("tfidf_transformer.pkl"):
+        return "tfidf_transformer.pkl"
+    return "tfidf_vectorizer.pkl"
+
+
+@memory.cache
+def vectorize_corpus(csv_path: str, tfidf_path: str, csv_mtime_ns: int, tfidf_mtime_ns: int):
+    """
+    TF-IDF matrix for every description in the CSV, as sorted CSC.
+    
+    Memoized on disk by joblib; the mtime arguments are only part of the
+    cache key, so a re-run with an unchanged CSV and vectorizer loads the
+    cached matrix instead of re-tokenizing the corpus.
+    """
+    print("Loading vectorizer...")
+    if tfidf_path == "tfidf_transformer.pkl":
+        tfidf = load_hashing_vectorizer(tfidf_path)
+    else:
+        tfidf = joblib.load(tfidf_path)
+    
+    # Load and transform data chunk by chunk, one chunk per worker process
+    # (loky: the regex tokenizer holds the GIL, so threads would not scale).
+    # Parallel pulls chunks from the reader lazily, so only a few chunks of
+    # raw text are in memory at a time; the sparse blocks are stacked at the end
+    print("Loading and transforming data...")
+    reader = pd.read_csv(
+        csv_path,
+        usecols=[TEXT_COL],
+        dtype={TEXT_COL: "string"},
+        engine="c",
+        on_bad_lines="skip",
+        chunksize=CHUNK_SIZE
+    )
+    chunks = joblib.Parallel(n_jobs=-1, backend="loky")(
+        joblib.delayed(tfidf.transform)(chunk[TEXT_COL].dropna().to_numpy())
+        for chunk in reader
+    )
+    
+    # Stack straight into CSC with sorted indices: IsolationForest works on
+    # CSC internally, and sorted column indices keep per-tree sample indexing
+    # on its fast path (scikit-learn >= 1.2)
+    X = scipy.sparse.vstack(chunks, format="csc")
+    X.sort_indices()
+    return X
+
+
+# 1. Check data
+if not os.path.exists(DATA_PATH):
+    print(f"Error: {DATA_PATH} not found.")
+    exit(1)
 
-# 2. Load existing Vectorizer
-print("Loading vectorizer...")
-try:
-    tfidf = joblib.load("tfidf_vectorizer.pkl")
-except FileNotFoundError:
+# 2. Check existing Vectorizer
+tfidf_path = vectorizer_path()
+if not os.path.exists(tfidf_path):
     print("Error: tfidf_vectorizer.pkl not found. Run train_model.py first.")
     exit(1)
 
-# 3. Transform data
-print("Transforming data...")
-X = tfidf.transform(df[TEXT_COL])
+# 3. Vectorize data (cached until the CSV or vectorizer changes)
+X = vectorize_corpus(
+    DATA_PATH,
+    tfidf_path,
+    os.stat(DATA_PATH).st_mtime_ns,
+    os.stat(tfidf_path).st_mtime_ns
+)
+print(f"Vectorized {X.shape[0]} descriptions")
 
 # 4. Train Isolation Forest
 print("Training Isolation Forest...")
-# contamination='auto' allows the model to determine the threshold
-clf_iso = IsolationForest(n_estimators=100, contamination='auto', random_state=42, n_jobs=-1)
+# contamination='auto' allows the model to determine the threshold;
+# each tree sees 256 samples, so fit cost does not grow with the corpus
+clf_iso = IsolationForest(
+    n_estimators=100,
+    max_samples=256,
+    max_features=1.0,  # Default, stated explicitly: no per-tree feature subsetting
+    contamination='auto',
+    random_state=42,
+    n_jobs=-1
+)
 clf_iso.fit(X)
 
 # 5. Save model
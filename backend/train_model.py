@@ -1,60 +1,119 @@
+import os
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfTransformer
+from sklearn.pipeline import make_pipeline
+from text_features import CachedTfidfVectorizer, make_hashing_vectorizer
+from sklearn.model_selection import StratifiedShuffleSplit
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import classification_report
 
+# TF-IDF front-end: "tfidf" (fitted 1000-term vocabulary, default) or
+# "hashing" (stateless HashingVectorizer + TfidfTransformer; no vocabulary
+# dict in memory, lower peak RSS on large corpora)
+VECTORIZER_KIND = os.getenv("CVE_VECTORIZER", "tfidf")
+# Classifier: "rf" (RandomForest on sparse TF-IDF, default) or "hgb"
+# (HistGradientBoosting on dense float32 TF-IDF; needs the 1000-term tfidf
+# front-end, since hashing features are far too wide to densify)
+CLASSIFIER_KIND = os.getenv("CVE_CLASSIFIER", "rf")
+if CLASSIFIER_KIND == "hgb" and VECTORIZER_KIND == "hashing":
+    raise SystemExit("CVE_CLASSIFIER=hgb requires CVE_VECTORIZER=tfidf (dense input)")
+VECTORIZER_PATH = "tfidf_vectorizer.pkl"
+TFIDF_TRANSFORMER_PATH = "tfidf_transformer.pkl"
+
 # -----------------------------
 # 1. Load dataset
 # -----------------------------
-df = pd.read_csv("cve_data.csv", engine="python", on_bad_lines="skip")
+TEXT_COL = "Description"
+SCORE_COL = "CVSS Score"
+
+# C parser, and only the two columns training uses
+df = pd.read_csv(
+    "cve_data.csv",
+    engine="c",
+    on_bad_lines="skip",
+    usecols=[TEXT_COL, SCORE_COL],
+    dtype={TEXT_COL: "string"}
+)
 
-print("\n📌 Available columns:")
+print("\n📌 Loaded columns:")
 print(df.columns)
 
 # -----------------------------
-# 2. Use correct columns
+# 2. Clean columns
 # -----------------------------
-TEXT_COL = "Description"
-SCORE_COL = "CVSS Score"
+
+# Parse scores in one vectorized pass; malformed scores become NaN and are
+# dropped with the missing values instead of aborting the run
+df[SCORE_COL] = pd.to_numeric(df[SCORE_COL], errors="coerce")
 
 # Drop missing values
-df = df[df[TEXT_COL].notnull() & df[SCORE_COL].notnull()]
+df = df.dropna(subset=[TEXT_COL, SCORE_COL])
 
 # -----------------------------
 # 3. Create labels using CVSS
 # -----------------------------
-df["label"] = df[SCORE_COL].apply(lambda x: 1 if float(x) >= 7.0 else 0)
+df["label"] = (df[SCORE_COL].to_numpy(dtype=np.float32) >= 7.0).astype(np.int8)
 
 # -----------------------------
 # 4. TF-IDF Vectorization
 # -----------------------------
-tfidf = TfidfVectorizer(
-    max_features=1000,
-    stop_words="english"
-)
+if VECTORIZER_KIND == "hashing":
+    # Single streaming pass; only the IDF vector is fitted and saved
+    tfidf = make_pipeline(make_hashing_vectorizer(), TfidfTransformer())
+else:
+    # Memoizes tokenization of repeated descriptions; saved as a plain
+    # TfidfVectorizer
+    tfidf = CachedTfidfVectorizer(
+        max_features=1000,
+        stop_words="english"
+    )
 
 X = tfidf.fit_transform(df[TEXT_COL])
 y = df["label"]
 
+if CLASSIFIER_KIND == "hgb":
+    # 1000 float32 columns: ~4 KB per row
+    X = X.toarray().astype(np.float32)
+
 # -----------------------------
 # 5. Train-test split
 # -----------------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+# Stratified so both splits keep the HIGH/LOW ratio; index arrays let
+# each split be taken with one row-slice of X
+sss = StratifiedShuffleSplit(n_splits=1, test_size=0.2, random_state=42)
+train_idx, test_idx = next(sss.split(np.zeros(X.shape[0]), y))
+X_train, X_test = X[train_idx], X[test_idx]
+y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
 
 # -----------------------------
 # 6. Train model
 # -----------------------------
-clf = RandomForestClassifier(
-    n_estimators=100,
-    random_state=42
-)
+if CLASSIFIER_KIND == "hgb":
+    # Histogram binning (uint8 bins) with early stopping on a holdout split
+    clf = HistGradientBoostingClassifier(
+        max_iter=200,
+        max_bins=255,
+        early_stopping=True,
+        random_state=42
+    )
+else:
+    # Depth/leaf limits keep each tree small enough to stay cache-resident
+    # at serve time (unbounded trees mostly memorize single training rows)
+    clf = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=20,
+        min_samples_leaf=5,
+        max_features="sqrt",
+        n_jobs=-1,
+        random_state=42
+    )
 clf.fit(X_train, y_train)
 
+if CLASSIFIER_KIND != "hgb":
+    print(f"\n🌲 Forest size: {sum(t.tree_.node_count for t in clf.estimators_):,} nodes")
+
 # -----------------------------
 # 7. Evaluation
 # -----------------------------
@@ -65,10 +124,38 @@ print(classification_report(y_test, y_pred))
 # -----------------------------
 # 8. Save model & vectorizer
 # -----------------------------
-joblib.dump(clf, "rf_model.pkl")
-joblib.dump(tfidf, "tfidf_vectorizer.pkl")
+joblib.dump(clf, "rf_model.pkl", compress=3)
+print(f"📦 rf_model.pkl: {os.path.getsize('rf_model.pkl') / 1e6:.1f} MB")
+
+if VECTORIZER_KIND == "hashing":
+    # HashingVectorizer is stateless; text_features rebuilds it at load time
+    vectorizer_file, stale_file = TFIDF_TRANSFORMER_PATH, VECTORIZER_PATH
+    joblib.dump(tfidf[-1], vectorizer_file)
+else:
+    vectorizer_file, stale_file = VECTORIZER_PATH, TFIDF_TRANSFORMER_PATH
+    joblib.dump(tfidf, vectorizer_file)
+
+# Inference picks up whichever vectorizer artifact exists (the transformer
+# first), so one from a previous run in the other mode must not linger
+if os.path.exists(stale_file):
+    os.remove(stale_file)
+    print(f"🧹 Removed stale {stale_file}")
+
+# Refresh the ONNX export (served in preference to rf_model.pkl) so it
+# never lags the freshly trained model; drop it if it cannot be rebuilt
+try:
+    if VECTORIZER_KIND == "hashing":
+        raise RuntimeError("hashed features are too wide for the dense ONNX input")
+    from export_onnx import export_classifier
+    max_diff = export_classifier(clf, "rf_model.onnx")
+    print(f"✅ ONNX model saved as rf_model.onnx (max prob diff {max_diff:.2e})")
+except Exception as e:
+    if os.path.exists("rf_model.onnx"):
+        os.remove("rf_model.onnx")
+        print("🧹 Removed stale rf_model.onnx")
+    print(f"ℹ️  ONNX export skipped ({e}); serving will use rf_model.pkl")
 
 print("\n✅ Model saved as rf_model.pkl")
-print("✅ TF-IDF vectorizer saved as tfidf_vectorizer.pkl")
+print(f"✅ TF-IDF vectorizer saved as {vectorizer_file}")
 print("🚀 Training completed successfully")
 